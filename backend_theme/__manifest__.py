@@ -14,7 +14,13 @@
     ],
     "assets": {
         "web.assets_backend": [
-            "backend_theme/static/src/backend/**/*",
+            "backend_theme/static/src/backend/app_menu/action_container.js",
+            "backend_theme/static/src/backend/app_menu/layout/style/animation.scss",
+            "backend_theme/static/src/backend/app_menu/layout/style/layout_colors.scss",
+            "backend_theme/static/src/backend/app_menu/layout/style/layout_style.scss",
+            "backend_theme/static/src/backend/app_menu/layout/style/sidebar.scss",
+            "backend_theme/static/src/backend/app_menu/search_apps.js",
+            "backend_theme/static/src/backend/app_menu/side_menu.xml",
             "backend_theme/static/src/js/theme_colors.js",
         ],
         'web.assets_frontend': [
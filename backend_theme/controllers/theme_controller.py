@@ -1,33 +1,44 @@
 # -*- coding: utf-8 -*-
+import json
+
 from odoo import http
 from odoo.http import request
 
+# In-process cache of the serialized theme colors:
+# {dbname: ((primary_color, secondary_color), json_bytes)}.
+# Keyed by the color values themselves (get_param is ormcached), so any
+# set_param - settings form, system parameters, data files - is picked up.
+_THEME_CACHE = {}
+
 
 class ThemeController(http.Controller):
     """
     Controller for theme configuration endpoints
     """
 
-    @http.route('/backend_theme/get_colors', type='json', auth='user', methods=['POST'])
+    @http.route('/backend_theme/get_colors', type='http', auth='user', methods=['GET'])
     def get_theme_colors(self):
         """
         Get theme color configuration for primary and secondary colors.
 
         This endpoint uses sudo() to allow all authenticated users to retrieve
         theme colors regardless of their access rights to ir.config_parameter.
+        The serialized JSON body is cached per database, so repeated calls
+        return pre-encoded bytes without rebuilding the payload.
 
         Returns:
-            dict: Dictionary containing primary_color and secondary_color values
+            Response: JSON body containing primary_color and secondary_color
                 Example: {
                     'primary_color': '#6366f1',
                     'secondary_color': '#f8fafc'
                 }
         """
-        try:
-            # Use sudo() to allow all users to read theme configuration
-            config_param = request.env['ir.config_parameter'].sudo()
+        # Use sudo() to allow all users to read theme configuration
+        config_param = request.env['ir.config_parameter'].sudo()
+        dbname = request.env.cr.dbname
 
-            # Fetch both color configurations
+        # Fetch both color configurations
+        try:
             primary_color = config_param.get_param(
                 'backend_theme.primary_color',
                 default='#6366f1'  # Default: Indigo-500
@@ -36,16 +47,31 @@ class ThemeController(http.Controller):
                 'backend_theme.secondary_color',
                 default='#f8fafc'  # Default: Slate-50
             )
+        except Exception as e:
+            # Return default colors if the configuration cannot be read
+            return self._default_colors_response(e)
 
-            return {
-                'primary_color': primary_color,
-                'secondary_color': secondary_color
-            }
+        # Serve the pre-encoded body while the colors are unchanged
+        colors = (primary_color, secondary_color)
+        cached = _THEME_CACHE.get(dbname)
+        if cached and cached[0] == colors:
+            return self._json_response(cached[1])
 
-        except Exception as e:
-            # Return default colors if any error occurs
-            return {
-                'primary_color': '#6366f1',
-                'secondary_color': '#f8fafc',
-                'error': str(e)
-            }
+        body = json.dumps({
+            'primary_color': primary_color,
+            'secondary_color': secondary_color
+        }).encode()
+        _THEME_CACHE[dbname] = (colors, body)
+        return self._json_response(body)
+
+    def _default_colors_response(self, error):
+        """Default colors with the error that prevented reading the configuration."""
+        return self._json_response(json.dumps({
+            'primary_color': '#6366f1',
+            'secondary_color': '#f8fafc',
+            'error': str(error)
+        }).encode())
+
+    def _json_response(self, body):
+        """Wrap pre-encoded JSON bytes in an HTTP response."""
+        return request.make_response(body, headers=[('Content-Type', 'application/json')])
@@ -69,9 +69,12 @@ class ResConfigSettings(models.TransientModel):
         """
         params = self.env['ir.config_parameter'].sudo()
 
-        # Reset to modern theme default colors
-        params.set_param('backend_theme.primary_color', '#6366f1')
-        params.set_param('backend_theme.secondary_color', '#f8fafc')
+        # Reset to modern theme default colors, skipping writes (and the
+        # cache invalidation they trigger) when already at defaults
+        if params.get_param('backend_theme.primary_color') != '#6366f1':
+            params.set_param('backend_theme.primary_color', '#6366f1')
+        if params.get_param('backend_theme.secondary_color') != '#f8fafc':
+            params.set_param('backend_theme.secondary_color', '#f8fafc')
 
         # Update current form values
         self.theme_primary_color = '#6366f1'
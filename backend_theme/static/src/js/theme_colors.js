@@ -1,7 +1,6 @@
 /** @odoo-module */
 
 import { registry } from "@web/core/registry";
-import { rpc } from "@web/core/network/rpc";
 
 /**
  * Color Manipulation Utilities
@@ -92,7 +91,11 @@ const themeColorsService = {
      */
     async loadAndApplyThemeColors() {
         try {
-            const result = await rpc('/backend_theme/get_colors');
+            const response = await fetch('/backend_theme/get_colors');
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const result = await response.json();
 
             // Apply colors to CSS variables
             this.applyColors({
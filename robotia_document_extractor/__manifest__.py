@@ -33,13 +33,8 @@
     'application': True,
     'assets': {
         'web.assets_backend': [
-            # Utilities (must load first)
-            'robotia_document_extractor/static/src/js/utils/chart_utils.js',
-
-            # Page Selector (Client Action)
-            'robotia_document_extractor/static/src/js/extraction_page_selector.js',
-            'robotia_document_extractor/static/src/xml/extraction_page_selector.xml',
-            'robotia_document_extractor/static/src/scss/extraction_page_selector_stepper.scss',
+            # Lazy client action loaders (real components live in robotia_document_extractor.lazy_assets)
+            'robotia_document_extractor/static/src/js/lazy/lazy_actions.js',
 
             # Widgets
             'robotia_document_extractor/static/src/js/validation_stats_widget.js',
@@ -50,6 +45,80 @@
             'robotia_document_extractor/static/src/xml/raw_ocr_viewer.xml',
             'robotia_document_extractor/static/src/scss/raw_ocr_viewer.scss',
 
+            # ChatBot Systray
+            'robotia_document_extractor/static/src/js/systray/chatbot_systray.js',
+            'robotia_document_extractor/static/src/xml/chatbot_systray.xml',
+            'robotia_document_extractor/static/src/scss/chatbot_systray.scss',
+
+            # Field Replacement for X2ManyField (Global Patch - must load before other X2Many widgets)
+            'robotia_document_extractor/static/src/js/field_replacement/field_replacement_list_renderer.js',
+            'robotia_document_extractor/static/src/js/field_replacement/field_replacement_x2many.js',
+
+            # X2Many Numbered Widget (with row numbers)
+            'robotia_document_extractor/static/src/js/x2many_numbered/x2many_numbered_list_renderer.js',
+            'robotia_document_extractor/static/src/js/x2many_numbered/x2many_numbered_field.js',
+            'robotia_document_extractor/static/src/js/x2many_numbered/x2many_numbered_list_renderer.xml',
+            'robotia_document_extractor/static/src/js/x2many_numbered/x2many_numbered.scss',
+
+            # Grouped One2many Widget (section + row numbering + grouped columns)
+            'robotia_document_extractor/static/src/js/grouped_one2many/extraction_grouped_list_renderer.js',
+            'robotia_document_extractor/static/src/js/grouped_one2many/extraction_grouped_list_renderer.xml',
+            'robotia_document_extractor/static/src/js/grouped_one2many/extraction_grouped_one2many_field.js',
+
+            # Ace Copy Field Widget (ace editor with copy/download buttons)
+            'robotia_document_extractor/static/src/js/fields/ace_copy_field.js',
+            'robotia_document_extractor/static/src/xml/ace_copy_field.xml',
+            'robotia_document_extractor/static/src/scss/ace_copy_field.scss',
+
+            # Extraction Form View (split PDF preview)
+            'robotia_document_extractor/static/src/js/form_view/extraction_form_view.js',
+            'robotia_document_extractor/static/src/xml/extraction_form_view.xml',
+            'robotia_document_extractor/static/src/scss/extraction_form.scss',
+
+            # PDF URL Viewer Widget
+            'robotia_document_extractor/static/src/js/fields/pdf_url_viewer.js',
+
+            # Section One2many Widget (title rows)
+            'robotia_document_extractor/static/src/js/section_one2many/extraction_section_list_renderer.js',
+            'robotia_document_extractor/static/src/js/section_one2many/extraction_section_one2many_field.js',
+            'robotia_document_extractor/static/src/js/section_one2many/extraction_title_field.js',
+            'robotia_document_extractor/static/src/js/section_one2many/extraction_title_field.xml',
+            'robotia_document_extractor/static/src/scss/extraction_section.scss',
+
+            # Grouped List View
+            'robotia_document_extractor/static/src/group_list_view/group_list_arch_parser.js',
+            'robotia_document_extractor/static/src/group_list_view/group_list_renderer.js',
+            'robotia_document_extractor/static/src/group_list_view/group_list_renderer.xml',
+            'robotia_document_extractor/static/src/group_list_view/group_list_controller.js',
+            'robotia_document_extractor/static/src/group_list_view/grouped_x2many_field.js',
+
+            # List without automatic column widths
+            'robotia_document_extractor/static/src/no_magic_width_list/no_magic_width_list.js'
+        ],
+        # Loaded on demand by js/lazy/lazy_actions.js when one of these
+        # client actions is opened for the first time
+        'robotia_document_extractor.lazy_assets': [
+            # Utilities (must load first)
+            'robotia_document_extractor/static/src/js/utils/chart_utils.js',
+
+            # Skeleton Loader
+            'robotia_document_extractor/static/src/js/components/skeleton_loader.js',
+            'robotia_document_extractor/static/src/xml/skeleton_loader.xml',
+            'robotia_document_extractor/static/src/scss/skeleton_loader.scss',
+
+            # Page Selector (Client Action)
+            'robotia_document_extractor/static/src/js/extraction_page_selector.js',
+            'robotia_document_extractor/static/src/xml/extraction_page_selector.xml',
+            'robotia_document_extractor/static/src/scss/extraction_page_selector_stepper.scss',
+
+            # Main Dashboard (upload, statistics, recent extractions)
+            'robotia_document_extractor/static/src/js/dashboard/upload_area.js',
+            'robotia_document_extractor/static/src/js/dashboard/statistics_card.js',
+            'robotia_document_extractor/static/src/js/dashboard/recent_extractions.js',
+            'robotia_document_extractor/static/src/js/dashboard/dashboard.js',
+            'robotia_document_extractor/static/src/xml/dashboard.xml',
+            'robotia_document_extractor/static/src/scss/dashboard.scss',
+
             # Dashboards (JS)
             'robotia_document_extractor/static/src/js/dashboard/substance_dashboard.js',
             'robotia_document_extractor/static/src/js/dashboard/company_dashboard.js',
@@ -63,12 +132,7 @@
             'robotia_document_extractor/static/src/xml/chatbot.xml',
             'robotia_document_extractor/static/src/scss/chatbot.scss',
 
-            # ChatBot Systray
-            'robotia_document_extractor/static/src/js/systray/chatbot_systray.js',
-            'robotia_document_extractor/static/src/xml/chatbot_systray.xml',
-            'robotia_document_extractor/static/src/scss/chatbot_systray.scss',
-
-            # Templates (XML)
+            # Dashboards (XML)
             'robotia_document_extractor/static/src/xml/substance_dashboard.xml',
             'robotia_document_extractor/static/src/xml/company_dashboard.xml',
             'robotia_document_extractor/static/src/xml/equipment_dashboard.xml',
@@ -76,7 +140,7 @@
             'robotia_document_extractor/static/src/xml/hfc_dashboard.xml',
             'robotia_document_extractor/static/src/xml/overview_dashboard.xml',
 
-            # Styles (SCSS)
+            # Dashboards (SCSS)
             'robotia_document_extractor/static/src/scss/substance_dashboard.scss',
             'robotia_document_extractor/static/src/scss/company_dashboard.scss',
             'robotia_document_extractor/static/src/scss/equipment_dashboard.scss',
@@ -84,26 +148,6 @@
             'robotia_document_extractor/static/src/scss/hfc_dashboard.scss',
             'robotia_document_extractor/static/src/scss/overview_dashboard.scss',
 
-            # Field Replacement for X2ManyField (Global Patch - must load before other X2Many widgets)
-            'robotia_document_extractor/static/src/js/field_replacement/field_replacement_list_renderer.js',
-            'robotia_document_extractor/static/src/js/field_replacement/field_replacement_x2many.js',
-
-            # X2Many Numbered Widget (with row numbers)
-            'robotia_document_extractor/static/src/js/x2many_numbered/x2many_numbered_list_renderer.js',
-            'robotia_document_extractor/static/src/js/x2many_numbered/x2many_numbered_field.js',
-            'robotia_document_extractor/static/src/js/x2many_numbered/x2many_numbered_list_renderer.xml',
-            'robotia_document_extractor/static/src/js/x2many_numbered/x2many_numbered.scss',
-
-            # Grouped One2many Widget (section + row numbering + grouped columns)
-            'robotia_document_extractor/static/src/js/grouped_one2many/extraction_grouped_list_renderer.js',
-            'robotia_document_extractor/static/src/js/grouped_one2many/extraction_grouped_list_renderer.xml',
-            'robotia_document_extractor/static/src/js/grouped_one2many/extraction_grouped_one2many_field.js',
-
-            # Ace Copy Field Widget (ace editor with copy/download buttons)
-            'robotia_document_extractor/static/src/js/fields/ace_copy_field.js',
-            'robotia_document_extractor/static/src/xml/ace_copy_field.xml',
-            'robotia_document_extractor/static/src/scss/ace_copy_field.scss',
-
             # Settings Dashboard (Main Component)
             'robotia_document_extractor/static/src/js/dashboard/settings_dashboard.js',
 
@@ -125,10 +169,7 @@
             'robotia_document_extractor/static/src/scss/settings/users_tab.scss',
             'robotia_document_extractor/static/src/scss/settings/ai_tab.scss',
             'robotia_document_extractor/static/src/scss/settings/backup_tab.scss',
-            'robotia_document_extractor/static/src/scss/settings/logs_tab.scss',
-
-            # Other existing files
-            'robotia_document_extractor/static/src/**/*'
+            'robotia_document_extractor/static/src/scss/settings/logs_tab.scss'
         ],
     },
     'external_dependencies': {
@@ -4,8 +4,26 @@ from odoo import http
 from odoo.http import request
 import logging
 
+from .utils import json_response
+
 _logger = logging.getLogger(__name__)
 
+# Model names used by the chatbot routes
+_CONVERSATION_MODEL = 'chatbot.conversation'
+_MESSAGE_MODEL = 'chatbot.message'
+_SERVICE_MODEL = 'chatbot.service'
+
+# Fallback payload returned when the chatbot fails
+_ERROR_MESSAGE = 'Xin lỗi, đã có lỗi xảy ra. Vui lòng thử lại.'
+_ERROR_SUGGESTIONS = ('Thử lại', 'Trang chủ')
+
+# History page size (default) and upper bound on a single page
+_HISTORY_PAGE_SIZE = 50
+_HISTORY_LIMIT = 500
+
+# Shared empty default (serialized as an empty JSON array)
+_EMPTY = ()
+
 class ChatbotController(http.Controller):
     """
     Chatbot RPC endpoints
@@ -28,82 +46,128 @@ class ChatbotController(http.Controller):
                 'suggestions': list
             }
         """
+        env = request.env
+        uid = env.user.id
+        Conversation = env[_CONVERSATION_MODEL]
+        Message = env[_MESSAGE_MODEL]
+        chatbot_service = env[_SERVICE_MODEL]
+
+        # Get or create conversation (a missing or foreign conversation
+        # id starts a new one)
+        if not conversation_id or not Conversation.search_count(
+                [('id', '=', conversation_id), ('user_id', '=', uid)]):
+            conversation_id = Conversation.create({'user_id': uid}).id
+
+        # Get AI response (the current message is passed explicitly,
+        # so it must not be persisted yet or it would appear twice in
+        # the history sent to Gemini). Only the AI call is guarded: ORM
+        # errors propagate to the standard JSON-RPC error handling.
         try:
-            # Get or create conversation
-            if not conversation_id:
-                conversation = request.env['chatbot.conversation'].create({
-                    'user_id': request.env.user.id
-                })
-                conversation_id = conversation.id
-            else:
-                conversation = request.env['chatbot.conversation'].browse(conversation_id)
-                if not conversation.exists() or conversation.user_id.id != request.env.user.id:
-                    # Invalid conversation, create new
-                    conversation = request.env['chatbot.conversation'].create({
-                        'user_id': request.env.user.id
-                    })
-                    conversation_id = conversation.id
-
-            # Save user message
-            request.env['chatbot.message'].create({
-                'conversation_id': conversation_id,
-                'role': 'user',
-                'content': message
-            })
-
-            # Get AI response
-            chatbot_service = request.env['chatbot.service']
             response = chatbot_service.get_response(message, conversation_id)
-
-            # Save assistant message
-            request.env['chatbot.message'].create({
-                'conversation_id': conversation_id,
-                'role': 'assistant',
-                'content': response['message'],
-                'action_type': response.get('action', {}).get('type') if response.get('action') else None,
-                'action_data': response.get('action')
-            })
-
+        except Exception as e:
+            _logger.error("Chatbot error: %s", e, exc_info=True)
             return {
                 'conversation_id': conversation_id,
-                'message': response['message'],
-                'action': response.get('action'),
-                'suggestions': response.get('suggestions', [])
+                'message': _ERROR_MESSAGE,
+                'action': None,
+                'suggestions': _ERROR_SUGGESTIONS
             }
-
-        except Exception as e:
-            _logger.error(f"Chatbot error: {str(e)}", exc_info=True)
+        reply = response.get('message')
+        action = response.get('action')
+
+        user_vals = {
+            'conversation_id': conversation_id,
+            'role': 'user',
+            'content': message
+        }
+
+        # Nothing to persist for an empty reply
+        if not reply:
+            Message.create(user_vals)
             return {
-                'conversation_id': conversation_id if conversation_id else None,
-                'message': 'Xin lỗi, đã có lỗi xảy ra. Vui lòng thử lại.',
+                'conversation_id': conversation_id,
+                'message': '',
                 'action': None,
-                'suggestions': ['Thử lại', 'Trang chủ']
+                'suggestions': response.get('suggestions') or _EMPTY
             }
 
-    @http.route('/chatbot/conversation/history', type='json', auth='user')
-    def get_conversation_history(self, conversation_id):
-        """Get conversation history"""
-        try:
-            conversation = request.env['chatbot.conversation'].browse(conversation_id)
+        # Save user and assistant messages in a single batch, in the same
+        # transaction, so the next turn's history always contains this reply
+        assistant_vals = {
+            'conversation_id': conversation_id,
+            'role': 'assistant',
+            'content': reply,
+        }
+        if action:
+            assistant_vals['action_data'] = action
+        Message.create([user_vals, assistant_vals])
+
+        return {
+            'conversation_id': conversation_id,
+            'message': reply,
+            'action': action,
+            'suggestions': response.get('suggestions', _EMPTY)
+        }
+
+    @http.route('/chatbot/conversation/history', type='http', auth='user', methods=['GET'])
+    def get_conversation_history(self, conversation_id, limit=_HISTORY_PAGE_SIZE, before_id=None):
+        """
+        Get one page of conversation history
 
-            if not conversation.exists() or conversation.user_id.id != request.env.user.id:
-                return {'error': 'Conversation not found'}
+        Plain HTTP route so the payload is serialized once (with orjson when
+        available) instead of going through the JSON-RPC layer. Pages are
+        fetched newest first with an id cursor and returned oldest first.
 
-            messages = []
-            for msg in conversation.message_ids:
-                messages.append({
-                    'id': msg.id,
-                    'role': msg.role,
-                    'content': msg.content,
-                    'timestamp': msg.create_date.isoformat(),
-                    'action': msg.action_data
-                })
+        Args:
+            conversation_id (str): Conversation ID from the query string
+            limit (str): Page size (clamped to 1.._HISTORY_LIMIT)
+            before_id (str): Optional cursor, only messages with a lower id
+                are returned
 
-            return {
-                'conversation_id': conversation_id,
-                'messages': messages
-            }
+        Returns:
+            Response: JSON body {
+                'conversation_id': int,
+                'messages': list,
+                'has_more': bool,
+                'next_cursor': int or None
+            } or {'error': str}
+        """
+        env = request.env
+        uid = env.user.id
+        Conversation = env[_CONVERSATION_MODEL]
+        Message = env[_MESSAGE_MODEL]
+
+        try:
+            conversation_id = int(conversation_id)
+            limit = max(1, min(int(limit), _HISTORY_LIMIT))
+            if not Conversation.search_count([('id', '=', conversation_id), ('user_id', '=', uid)]):
+                payload = {'error': 'Conversation not found'}
+            else:
+                domain = [('conversation_id', '=', conversation_id)]
+                if before_id:
+                    domain.append(('id', '<', int(before_id)))
+                rows = Message.search_read(
+                    domain,
+                    ['id', 'role', 'content', 'create_date', 'action_data'],
+                    order='id desc',
+                    limit=limit
+                )
+                rows.reverse()
+                payload = {
+                    'conversation_id': conversation_id,
+                    'has_more': len(rows) == limit,
+                    'next_cursor': rows[0]['id'] if rows else None,
+                    'messages': [{
+                        'id': row['id'],
+                        'role': row['role'],
+                        'content': row['content'],
+                        'timestamp': row['create_date'].isoformat(),
+                        'action': row['action_data']
+                    } for row in rows]
+                }
 
         except Exception as e:
-            _logger.error(f"Error getting conversation history: {str(e)}")
-            return {'error': str(e)}
+            _logger.error("Error getting conversation history: %s", e)
+            payload = {'error': str(e)}
+
+        return json_response(payload)
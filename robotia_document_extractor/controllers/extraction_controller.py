@@ -1,13 +1,50 @@
 # -*- coding: utf-8 -*-
-from odoo import http, _
+from odoo import http, fields, _
 from odoo.http import request
-import base64
+from collections import defaultdict
+from copy import copy
+from datetime import datetime
+from io import BytesIO
+from itertools import islice
+import heapq
 import json
 import logging
+import os
 import time
 
+from .utils import json_response
+
 _logger = logging.getLogger(__name__)
 
+# Upload limit for page preview conversion (same 50MB as the upload area)
+_MAX_PDF_SIZE_MB = 50
+_MAX_PDF_SIZE_BYTES = _MAX_PDF_SIZE_MB * 1024 * 1024
+
+# Maximum rows returned in the equipment/recovery dashboard details tables
+_DASHBOARD_DETAILS_LIMIT = 100
+
+# Form labels shown in the company dashboard OCR history tab
+_OCR_HISTORY_TYPE_LABELS = {'01': 'Mẫu 01', '02': 'Mẫu 02'}
+
+# collection.recycling activity_type -> per-substance quantity column
+_ACTIVITY_TYPE_COLUMNS = {
+    'collection': 'collected',
+    'reuse': 'reused',
+    'recycle': 'recycled',
+    'disposal': 'destroyed',
+}
+
+
+def _average_present(*values):
+    """Average of the values that are not None, 0 if there are none"""
+    total = 0
+    count = 0
+    for value in values:
+        if value is not None:
+            total += value
+            count += 1
+    return total / count if count else 0
+
 
 class ExtractionController(http.Controller):
     """
@@ -25,46 +62,66 @@ class ExtractionController(http.Controller):
         FIX: Divide by count of non-null years, not always 3
 
         Args:
-            usage_record: substance.usage record with year_1/2/3 fields
+            usage_record: substance.usage record, or its read() dict, with year_1/2/3 fields
 
         Returns:
             tuple: (avg_kg, avg_co2)
         """
         # If avg fields already computed, use them
-        if usage_record.avg_quantity_kg is not None and usage_record.avg_quantity_co2 is not None:
-            return (usage_record.avg_quantity_kg, usage_record.avg_quantity_co2)
-
-        # Count non-null years for kg
-        kg_values = [
-            usage_record.year_1_quantity_kg,
-            usage_record.year_2_quantity_kg,
-            usage_record.year_3_quantity_kg
-        ]
-        co2_values = [
-            usage_record.year_1_quantity_co2,
-            usage_record.year_2_quantity_co2,
-            usage_record.year_3_quantity_co2
-        ]
-
-        kg_count = sum(1 for v in kg_values if v is not None)
-        co2_count = sum(1 for v in co2_values if v is not None)
-
-        # Calculate average (divide by actual count, not 3)
-        avg_kg = sum(v for v in kg_values if v is not None) / kg_count if kg_count > 0 else 0
-        avg_co2 = sum(v for v in co2_values if v is not None) / co2_count if co2_count > 0 else 0
-
+        avg_kg = usage_record['avg_quantity_kg']
+        avg_co2 = usage_record['avg_quantity_co2']
+        if avg_kg is not None and avg_co2 is not None:
+            return (avg_kg, avg_co2)
+
+        # Average over non-null years only (divide by actual count, not 3)
+        avg_kg = _average_present(
+            usage_record['year_1_quantity_kg'],
+            usage_record['year_2_quantity_kg'],
+            usage_record['year_3_quantity_kg'],
+        )
+        avg_co2 = _average_present(
+            usage_record['year_1_quantity_co2'],
+            usage_record['year_2_quantity_co2'],
+            usage_record['year_3_quantity_co2'],
+        )
         return (avg_kg, avg_co2)
 
-    @http.route('/robotia/pdf_to_images', type='json', auth='user', methods=['POST'])
-    def pdf_to_images(self, pdf_file):
+    @staticmethod
+    def _line_rows_by_document(documents, model_name, field_names, skip_titles=True):
         """
-        Convert PDF to images and store as public attachments
+        Fetch the lines of documents as plain dicts in one search_read
 
         Args:
-            pdf_file (str): Base64 encoded PDF
+            documents: document.extraction recordset
+            model_name (str): Line model with document_id (and is_title) fields
+            field_names (list): Line fields to read
+            skip_titles (bool): Leave out is_title section rows
 
         Returns:
-            dict: {
+            dict: {document id: [line dict, ...]}, lines in the model's _order
+        """
+        domain = [('document_id', 'in', documents.ids)]
+        if skip_titles:
+            domain.append(('is_title', '=', False))
+        rows_by_doc = defaultdict(list)
+        for row in documents.env[model_name].search_read(domain, ['document_id'] + field_names):
+            rows_by_doc[row['document_id'][0]].append(row)
+        return rows_by_doc
+
+    @http.route('/robotia/pdf_to_images/upload', type='http', auth='user', methods=['POST'])
+    def pdf_to_images_upload(self, pdf_file=None, **kwargs):
+        """
+        Convert an uploaded PDF to images and store them as public attachments
+
+        The browser posts the PDF as a file field, so no base64 copy is built
+        on either side and werkzeug spools the body to a temp file while the
+        request is parsed instead of holding it in memory.
+
+        Args:
+            pdf_file (FileStorage): Uploaded PDF
+
+        Returns:
+            Response: JSON body {
                 'status': 'success',
                 'pages': [
                     {
@@ -75,65 +132,93 @@ class ExtractionController(http.Controller):
                     },
                     ...
                 ]
-            }
+            } or {'status': 'error', 'message': str}
         """
         try:
-            # Decode PDF
-            pdf_binary = base64.b64decode(pdf_file)
+            if not pdf_file:
+                return json_response({'status': 'error', 'message': _('No PDF file uploaded')})
+
+            # Size from the spooled stream, signature from its first 1KB
+            stream = pdf_file.stream
+            size = stream.seek(0, 2)
+            stream.seek(0)
+            if size > _MAX_PDF_SIZE_BYTES:
+                result = {
+                    'status': 'error',
+                    'message': _('File size exceeds %(size)dMB limit') % {'size': _MAX_PDF_SIZE_MB},
+                }
+            elif b'%PDF' not in stream.read(1024):
+                result = {
+                    'status': 'error',
+                    'message': _('The uploaded file does not appear to be a valid PDF'),
+                }
+            else:
+                stream.seek(0)
+                result = self._create_page_attachments(pdf_file.read())
+        except Exception as e:
+            _logger.exception("Error converting PDF to images")
+            result = {'status': 'error', 'message': str(e)}
 
-            # Convert to images
-            ExtractionService = request.env['document.extraction.service'].sudo()
-            image_paths = ExtractionService._pdf_to_images(pdf_binary)
+        return json_response(result)
 
-            # Create attachments for each image
-            Attachment = request.env['ir.attachment'].sudo()
-            pages_metadata = []
+    def _create_page_attachments(self, pdf_binary):
+        """
+        Render PDF pages to PNG and store each one as a public attachment
 
-            for idx, path in enumerate(image_paths):
-                try:
-                    # Read image file
-                    with open(path, "rb") as image_file:
-                        image_binary = image_file.read()
-
-                    # Create public attachment
-                    filename = f"page_{idx}.png"
-                    attachment = Attachment.create({
-                        'name': filename,
-                        'type': 'binary',
-                        'datas': base64.b64encode(image_binary).decode('utf-8'),
-                        'res_model': 'document.extraction',
-                        'res_id': 0,  # Temporary attachment
-                        'public': True,  # Makes accessible via URL
-                        'mimetype': 'image/png',
-                        'description': f'PDF page preview {idx}',
-                    })
+        Args:
+            pdf_binary (bytes): PDF binary data
 
-                    # Build metadata
-                    pages_metadata.append({
-                        'attachment_id': attachment.id,
-                        'url': f'/web/content/{attachment.id}',
-                        'page_num': idx,
-                        'filename': filename,
-                    })
+        Returns:
+            dict: {'status': 'success', 'pages': [...]} as documented on pdf_to_images_upload
+        """
+        # Convert to images
+        ExtractionService = request.env['document.extraction.service'].sudo()
+        image_paths = ExtractionService._pdf_to_images(pdf_binary)
 
-                    _logger.info(f"Created attachment {attachment.id} for page {idx}")
+        # Create attachments for each image
+        Attachment = request.env['ir.attachment'].sudo()
+        pages_metadata = []
 
-                finally:
-                    # Clean up temp file
-                    try:
-                        import os
-                        os.remove(path)
-                    except Exception as cleanup_error:
-                        _logger.warning(f"Failed to cleanup {path}: {cleanup_error}")
+        for idx, path in enumerate(image_paths):
+            try:
+                # Read image file
+                with open(path, "rb") as image_file:
+                    image_binary = image_file.read()
+
+                # Create public attachment
+                filename = f"page_{idx}.png"
+                attachment = Attachment.create({
+                    'name': filename,
+                    'type': 'binary',
+                    'raw': image_binary,
+                    'res_model': 'document.extraction',
+                    'res_id': 0,  # Temporary attachment
+                    'public': True,  # Makes accessible via URL
+                    'mimetype': 'image/png',
+                    'description': f'PDF page preview {idx}',
+                })
 
-            return {
-                'status': 'success',
-                'pages': pages_metadata
-            }
+                # Build metadata
+                pages_metadata.append({
+                    'attachment_id': attachment.id,
+                    'url': f'/web/content/{attachment.id}',
+                    'page_num': idx,
+                    'filename': filename,
+                })
 
-        except Exception as e:
-            _logger.exception("Error converting PDF to images")
-            return {'status': 'error', 'message': str(e)}
+                _logger.info(f"Created attachment {attachment.id} for page {idx}")
+
+            finally:
+                # Clean up temp file
+                try:
+                    os.remove(path)
+                except Exception as cleanup_error:
+                    _logger.warning(f"Failed to cleanup {path}: {cleanup_error}")
+
+        return {
+            'status': 'success',
+            'pages': pages_metadata
+        }
 
     @http.route('/robotia/extract_pages', type='json', auth='user', methods=['POST'])
     def extract_pages(self, attachment_ids, document_type='01', filename=None):
@@ -166,7 +251,7 @@ class ExtractionController(http.Controller):
             merged_attachment = Attachment.create({
                 'name': filename or f'merged_{document_type}.pdf',
                 'type': 'binary',
-                'datas': base64.b64encode(merged_pdf_binary).decode('utf-8'),
+                'raw': merged_pdf_binary,
                 'res_model': 'extraction.job',
                 'mimetype': 'application/pdf',
                 'description': f'Merged PDF for extraction job',
@@ -389,8 +474,33 @@ class ExtractionController(http.Controller):
                 'message': str(e)
             }
 
-    @http.route('/document_extractor/company_dashboard_data', type='json', auth='user', methods=['POST'])
+    @http.route('/document_extractor/company_dashboard_data', type='http', auth='user', methods=['GET'])
     def get_company_dashboard_data(self, organization_id=None, year_from=None, year_to=None):
+        """
+        Company dashboard data as a plain JSON response
+
+        The payload grows with the number of documents (trend, quota and
+        per-table rows), so it is serialized once with orjson when
+        available instead of going through the JSON-RPC layer.
+
+        Args:
+            organization_id (str): Organization/Partner ID from the query string
+            year_from (str, optional): Start year filter
+            year_to (str, optional): End year filter
+
+        Returns:
+            Response: JSON body as returned by _get_company_dashboard_payload
+        """
+        try:
+            organization_id = int(organization_id) if organization_id else None
+            year_from = int(year_from) if year_from else None
+            year_to = int(year_to) if year_to else None
+        except ValueError:
+            return json_response({'error': True, 'message': 'Invalid dashboard filter'})
+
+        return json_response(self._get_company_dashboard_payload(organization_id, year_from, year_to))
+
+    def _get_company_dashboard_payload(self, organization_id=None, year_from=None, year_to=None):
         """
         Get aggregated data for company dashboard
 
@@ -423,95 +533,92 @@ class ExtractionController(http.Controller):
 
             documents = Document.search(domain)
 
-            # Eager load all related One2many fields to prevent N+1 queries
-            # Force ORM to fetch all relations in batch
-            documents.mapped('substance_usage_ids.substance_id')
-            documents.mapped('substance_usage_ids.substance_name')
-            documents.mapped('substance_usage_ids.usage_type')
-            documents.mapped('substance_usage_ids.avg_quantity_kg')
-            documents.mapped('substance_usage_ids.avg_quantity_co2')
-            documents.mapped('substance_usage_ids.year_1_quantity_kg')
-            documents.mapped('substance_usage_ids.year_2_quantity_kg')
-            documents.mapped('substance_usage_ids.year_3_quantity_kg')
-            documents.mapped('substance_usage_ids.year_1_quantity_co2')
-            documents.mapped('substance_usage_ids.year_2_quantity_co2')
-            documents.mapped('substance_usage_ids.year_3_quantity_co2')
-            documents.mapped('quota_usage_ids.substance_name')
-            documents.mapped('quota_usage_ids.total_quota_kg')
-            documents.mapped('equipment_product_ids.product_type')
-            documents.mapped('equipment_product_ids.equipment_type_id')
-            documents.mapped('equipment_ownership_ids.equipment_type_id')
-            documents.mapped('collection_recycling_ids.activity_type')
-            documents.mapped('collection_recycling_ids.quantity_kg')
-            documents.mapped('collection_recycling_report_ids.collection_quantity_kg')
-            documents.mapped('equipment_product_report_ids')
-            documents.mapped('equipment_ownership_report_ids')
+            # Form type, table flags and year in one read; the table helpers
+            # fetch their lines with search_read
+            document_rows = documents.read([
+                'year', 'document_type', 'has_table_1_1', 'has_table_1_2', 'has_table_1_3',
+                'has_table_1_4', 'has_table_2_1', 'has_table_2_4',
+            ])
 
-            # Aggregate KPIs
-            all_substance_usage = documents.mapped('substance_usage_ids').filtered(lambda r: not r.is_title)
-            all_quota_usage = documents.mapped('quota_usage_ids')
+            # Split documents by form type and table flags in one pass
+            buckets = self._bucket_dashboard_documents(documents, document_rows)
 
-            total_substances = len(set(
-                list(all_substance_usage.mapped('substance_name')) +
-                list(all_quota_usage.mapped('substance_name'))
-            ))
-
-            # Calculate total kg and CO2e from substance usage
-            # FIX: Use correct average calculation (divide by count of non-null years)
+            # Aggregate KPIs
+            cr = request.env.cr
+            cr.execute("""
+                SELECT COUNT(DISTINCT substance_name) FROM (
+                    SELECT substance_name FROM substance_usage
+                     WHERE document_id = ANY(%s) AND is_title IS NOT TRUE
+                    UNION
+                    SELECT substance_name FROM quota_usage
+                     WHERE document_id = ANY(%s)
+                ) names
+            """, (documents.ids, documents.ids))
+            total_substances = cr.fetchone()[0]
+
+            # Totals and trend by year/substance, summed in PostgreSQL.
+            # NULL averages count as 0, as the ORM reads them for
+            # _calculate_avg_quantity.
+            cr.execute("""
+                SELECT
+                    COALESCE(d.year, 0),
+                    su.substance_name,
+                    SUM(COALESCE(su.avg_quantity_kg, 0)),
+                    SUM(COALESCE(su.avg_quantity_co2, 0))
+                FROM substance_usage su
+                JOIN document_extraction d ON d.id = su.document_id
+                WHERE su.document_id = ANY(%s)
+                  AND su.is_title IS NOT TRUE
+                GROUP BY 1, 2
+                ORDER BY 1, 2
+            """, (documents.ids,))
+
+            # Single pass over the grouped rows for totals and trend
             total_kg = 0
             total_co2e = 0
-            for usage in all_substance_usage:
-                kg, co2 = self._calculate_avg_quantity(usage)
+            trend_data = {year: {} for year in documents.mapped('year')}
+            for year, substance, kg, co2 in cr.fetchall():
                 total_kg += kg
                 total_co2e += co2
+                trend_data.setdefault(year, {})[substance] = kg
 
             # Recovery rate calculation
             # Form 01: collection.recycling with activity_type='collection'
-            total_collected_form01 = 0
-            for doc in documents.filtered(lambda d: d.document_type == '01'):
-                collection_recs = doc.collection_recycling_ids.filtered(lambda r: r.activity_type == 'collection')
-                total_collected_form01 += sum(collection_recs.mapped('quantity_kg'))
-
             # Form 02: collection.recycling.report (field: collection_quantity_kg)
-            total_collected_form02 = sum(
-                documents.filtered(lambda d: d.document_type == '02')
-                .mapped('collection_recycling_report_ids.collection_quantity_kg')
-            )
+            cr.execute("""
+                SELECT
+                    (SELECT COALESCE(SUM(rec.quantity_kg), 0)
+                       FROM collection_recycling rec
+                       JOIN document_extraction d ON d.id = rec.document_id
+                      WHERE d.id = ANY(%s)
+                        AND d.document_type = '01'
+                        AND rec.activity_type = 'collection'),
+                    (SELECT COALESCE(SUM(crr.collection_quantity_kg), 0)
+                       FROM collection_recycling_report crr
+                       JOIN document_extraction d ON d.id = crr.document_id
+                      WHERE d.id = ANY(%s)
+                        AND d.document_type = '02')
+            """, (documents.ids, documents.ids))
+            total_collected_form01, total_collected_form02 = cr.fetchone()
             total_collected = total_collected_form01 + total_collected_form02
             recovery_rate = (total_collected / total_kg * 100) if total_kg > 0 else 0
 
-            # Trend data by year and substance
-            trend_data = {}
-            for doc in documents:
-                year = doc.year
-                if year not in trend_data:
-                    trend_data[year] = {}
-
-                # Aggregate by substance
-                for usage in doc.substance_usage_ids.filtered(lambda r: not r.is_title):
-                    substance = usage.substance_name
-                    if substance not in trend_data[year]:
-                        trend_data[year][substance] = 0
-
-                    # FIX: Use correct average calculation
-                    kg, _ = self._calculate_avg_quantity(usage)
-                    trend_data[year][substance] += kg
-
             # Quota allocated vs used
             quota_data = []
-            for doc in documents.filtered(lambda d: d.document_type == '02'):
-                for quota in doc.quota_usage_ids.filtered(lambda q: not q.is_title):
+            quotas_by_doc = self._line_rows_by_document(
+                buckets['form_02'], 'quota.usage', ['substance_name', 'allocated_quota_kg', 'total_quota_kg'],
+            )
+            for doc in buckets['form_02']:
+                for quota in quotas_by_doc.get(doc.id, ()):
                     quota_data.append({
                         'year': doc.year,
-                        'quota_allocated': quota.allocated_quota_kg or 0,
-                        'quota_used': quota.total_quota_kg or 0,
-                        'substance_name': quota.substance_name
+                        'quota_allocated': quota['allocated_quota_kg'] or 0,
+                        'quota_used': quota['total_quota_kg'] or 0,
+                        'substance_name': quota['substance_name']
                     })
 
             # Get unique activity fields
-            all_activity_fields = set()
-            for doc in documents:
-                all_activity_fields.update(doc.activity_field_ids.mapped('name'))
+            all_activity_fields = set(documents.mapped('activity_field_ids.name'))
 
             return {
                 'error': False,
@@ -534,11 +641,11 @@ class ExtractionController(http.Controller):
                     'quota_data': quota_data or [],
                 },
                 'tabs': {
-                    'table_1_1': self._get_table_1_1_data(documents),
-                    'table_1_2': self._get_table_1_2_data(documents),
-                    'table_1_3': self._get_table_1_3_data(documents),
-                    'table_2_1': self._get_table_2_1_data(documents),
-                    'table_2_4': self._get_table_2_4_data(documents),
+                    'table_1_1': self._get_table_1_1_data(buckets['table_1_1']),
+                    'table_1_2': self._get_table_1_2_data(buckets['table_1_2']),
+                    'table_1_3': self._get_table_1_3_data(buckets['table_1_3']),
+                    'table_2_1': self._get_table_2_1_data(buckets['table_2_1']),
+                    'table_2_4': self._get_table_2_4_data(buckets['table_1_4'], buckets['table_2_4']),
                     'ocr_history': self._get_ocr_history_data(documents),
                 }
             }
@@ -547,123 +654,181 @@ class ExtractionController(http.Controller):
             _logger.error(f'Error fetching company dashboard data: {str(e)}', exc_info=True)
             return {'error': True, 'message': str(e)}
 
+    @staticmethod
+    def _bucket_dashboard_documents(documents, document_rows):
+        """
+        Split dashboard documents by form type and table flags in a single pass
+
+        Args:
+            documents: document.extraction recordset
+            document_rows (list): documents.read() rows with document_type and has_table_* fields
+
+        Returns:
+            dict: {'form_02' | 'table_1_1' | ... | 'table_2_4': document.extraction recordset}
+        """
+        bucket_ids = {key: [] for key in (
+            'form_02', 'table_1_1', 'table_1_2', 'table_1_3', 'table_1_4', 'table_2_1', 'table_2_4',
+        )}
+        for row in document_rows:
+            doc_id = row['id']
+            if row['has_table_1_1']:
+                bucket_ids['table_1_1'].append(doc_id)
+            if row['has_table_1_2']:
+                bucket_ids['table_1_2'].append(doc_id)
+            if row['has_table_1_3']:
+                bucket_ids['table_1_3'].append(doc_id)
+            if row['document_type'] == '01':
+                if row['has_table_1_4']:
+                    bucket_ids['table_1_4'].append(doc_id)
+            elif row['document_type'] == '02':
+                bucket_ids['form_02'].append(doc_id)
+                if row['has_table_2_1']:
+                    bucket_ids['table_2_1'].append(doc_id)
+                if row['has_table_2_4']:
+                    bucket_ids['table_2_4'].append(doc_id)
+        return {key: documents.browse(ids) for key, ids in bucket_ids.items()}
+
     def _get_table_1_1_data(self, documents):
-        """Get Table 1.1 data (Production/Import/Export)"""
+        """Get Table 1.1 data (Production/Import/Export) for documents with has_table_1_1"""
         records = []
-        for doc in documents.filtered(lambda d: d.has_table_1_1):
-            for usage in doc.substance_usage_ids.filtered(lambda r: not r.is_title):
+        usages_by_doc = self._line_rows_by_document(documents, 'substance.usage', [
+            'usage_type', 'substance_name', 'avg_quantity_kg', 'avg_quantity_co2',
+            'year_1_quantity_kg', 'year_2_quantity_kg', 'year_3_quantity_kg',
+            'year_1_quantity_co2', 'year_2_quantity_co2', 'year_3_quantity_co2',
+        ])
+        usage_type_labels = dict(documents.env['substance.usage']._fields['usage_type'].selection)
+        for doc in documents:
+            for usage in usages_by_doc.get(doc.id, ()):
                 # FIX: Calculate correct average
                 kg, co2 = self._calculate_avg_quantity(usage)
 
                 records.append({
                     'year': doc.year,
-                    'activity': dict(usage._fields['usage_type'].selection).get(usage.usage_type, ''),
-                    'substance_name': usage.substance_name,
+                    'activity': usage_type_labels.get(usage['usage_type'], ''),
+                    'substance_name': usage['substance_name'],
                     'quantity_kg': kg,
                     'co2e': co2,
                 })
         return records
 
     def _get_table_1_2_data(self, documents):
-        """Get Table 1.2 data (Equipment containing substances)"""
+        """Get Table 1.2 data (Equipment containing substances) for documents with has_table_1_2"""
         records = []
-        for doc in documents.filtered(lambda d: d.has_table_1_2):
-            for equipment in doc.equipment_product_ids:
+        equipment_by_doc = self._line_rows_by_document(
+            documents, 'equipment.product', ['product_type', 'substance_name', 'quantity', 'capacity'],
+            skip_titles=False,
+        )
+        for doc in documents:
+            for equipment in equipment_by_doc.get(doc.id, ()):
                 records.append({
                     'year': doc.year,
-                    'equipment_type': equipment.equipment_type,
-                    'substance_name': equipment.substance_name,
-                    'quantity': equipment.quantity or 0,
-                    'capacity': equipment.capacity or 0,
+                    'equipment_type': equipment['product_type'],
+                    'substance_name': equipment['substance_name'],
+                    'quantity': equipment['quantity'] or 0,
+                    'capacity': equipment['capacity'] or 0,
                 })
         return records
 
     def _get_table_1_3_data(self, documents):
-        """Get Table 1.3 data (Equipment ownership)"""
+        """Get Table 1.3 data (Equipment ownership) for documents with has_table_1_3"""
         records = []
-        for doc in documents.filtered(lambda d: d.has_table_1_3):
-            for equipment in doc.equipment_ownership_ids:
+        equipment_by_doc = self._line_rows_by_document(documents, 'equipment.ownership', [
+            'equipment_type', 'start_year', 'capacity', 'equipment_quantity', 'substance_name',
+            'substance_quantity_per_refill', 'refill_frequency',
+        ], skip_titles=False)
+        for doc in documents:
+            for equipment in equipment_by_doc.get(doc.id, ()):
                 records.append({
                     'year': doc.year,
-                    'equipment_type': equipment.equipment_type,
-                    'year_start': equipment.start_year or '',
-                    'capacity': equipment.capacity or '',
-                    'quantity': equipment.equipment_quantity or 0,
-                    'substance_name': equipment.substance_name,
-                    'refill_amount': equipment.substance_quantity_per_refill or '',
-                    'refill_frequency': equipment.refill_frequency or '',
+                    'equipment_type': equipment['equipment_type'],
+                    'year_start': equipment['start_year'] or '',
+                    'capacity': equipment['capacity'] or '',
+                    'quantity': equipment['equipment_quantity'] or 0,
+                    'substance_name': equipment['substance_name'],
+                    'refill_amount': equipment['substance_quantity_per_refill'] or '',
+                    'refill_frequency': equipment['refill_frequency'] or '',
                 })
         return records
 
     def _get_table_2_1_data(self, documents):
-        """Get Table 2.1 data (Quota usage)"""
+        """Get Table 2.1 data (Quota usage) for form 02 documents with has_table_2_1"""
         records = []
-        for doc in documents.filtered(lambda d: d.document_type == '02' and d.has_table_2_1):
-            for quota in doc.quota_usage_ids.filtered(lambda q: not q.is_title):
+        quotas_by_doc = self._line_rows_by_document(documents, 'quota.usage', [
+            'substance_name', 'allocated_quota_kg', 'total_quota_kg', 'hs_code',
+        ])
+        for doc in documents:
+            for quota in quotas_by_doc.get(doc.id, ()):
                 records.append({
                     'year': doc.year,
-                    'substance_name': quota.substance_name,
-                    'quota_allocated_kg': quota.allocated_quota_kg or 0,
-                    'quota_used_kg': quota.total_quota_kg or 0,
-                    'hs_code': quota.hs_code or '',
+                    'substance_name': quota['substance_name'],
+                    'quota_allocated_kg': quota['allocated_quota_kg'] or 0,
+                    'quota_used_kg': quota['total_quota_kg'] or 0,
+                    'hs_code': quota['hs_code'] or '',
                 })
         return records
 
-    def _get_table_2_4_data(self, documents):
-        """Get Table 2.4 data (Collection & Recycling)"""
-        records = []
-        # Form 01 - collection.recycling uses activity_type field
-        for doc in documents.filtered(lambda d: d.document_type == '01' and d.has_table_1_4):
-            # Group by substance
-            substance_data = {}
-            for record in doc.collection_recycling_ids:
-                substance = record.substance_name
-                if substance not in substance_data:
-                    substance_data[substance] = {
-                        'year': doc.year,
-                        'substance_name': substance,
-                        'collected': 0,
-                        'reused': 0,
-                        'recycled': 0,
-                        'destroyed': 0,
-                    }
-                # Add based on activity_type
-                if record.activity_type == 'collection':
-                    substance_data[substance]['collected'] += record.quantity_kg or 0
-                elif record.activity_type == 'reuse':
-                    substance_data[substance]['reused'] += record.quantity_kg or 0
-                elif record.activity_type == 'recycle':
-                    substance_data[substance]['recycled'] += record.quantity_kg or 0
-                elif record.activity_type == 'disposal':
-                    substance_data[substance]['destroyed'] += record.quantity_kg or 0
-            records.extend(substance_data.values())
-
-        # Form 02 - collection.recycling.report has separate fields
-        for doc in documents.filtered(lambda d: d.document_type == '02' and d.has_table_2_4):
-            for report in doc.collection_recycling_report_ids:
-                records.append({
-                    'year': doc.year,
-                    'substance_name': report.substance_name,
-                    'collected': report.collection_quantity_kg or 0,
-                    'reused': report.reuse_quantity_kg or 0,
-                    'recycled': report.recycle_quantity_kg or 0,
-                    'destroyed': report.disposal_quantity_kg or 0,
-                })
-        return records
+    def _get_table_2_4_data(self, form01_documents, form02_documents):
+        """
+        Get Table 2.4 data (Collection & Recycling)
 
-    def _get_ocr_history_data(self, documents):
-        """Get OCR extraction history"""
-        records = []
-        for doc in documents:
+        Args:
+            form01_documents: Form 01 documents with has_table_1_4
+            form02_documents: Form 02 documents with has_table_2_4
+        """
+        env = form01_documents.env
+        year_by_doc = {doc.id: doc.year for doc in form01_documents | form02_documents}
+
+        # Form 01 - collection.recycling uses activity_type field:
+        # sum per (document, substance, activity) in PostgreSQL, then pivot
+        # the activity types into columns
+        substance_data = {}
+        for doc, substance, activity_type, quantity in env['collection.recycling']._read_group(
+            [('document_id', 'in', form01_documents.ids)],
+            groupby=['document_id', 'substance_name', 'activity_type'],
+            aggregates=['quantity_kg:sum'],
+        ):
+            row = substance_data.get((doc.id, substance))
+            if row is None:
+                row = substance_data[doc.id, substance] = {
+                    'year': year_by_doc[doc.id],
+                    'substance_name': substance,
+                    'collected': 0,
+                    'reused': 0,
+                    'recycled': 0,
+                    'destroyed': 0,
+                }
+            column = _ACTIVITY_TYPE_COLUMNS.get(activity_type)
+            if column:
+                row[column] += quantity or 0
+        records = list(substance_data.values())
+
+        # Form 02 - collection.recycling.report has separate fields, one row per line
+        for report in env['collection.recycling.report'].search_read(
+            [('document_id', 'in', form02_documents.ids)],
+            ['document_id', 'substance_name', 'collection_quantity_kg', 'reuse_quantity_kg',
+             'recycle_quantity_kg', 'disposal_quantity_kg'],
+        ):
             records.append({
-                'year': doc.year,
-                'document_type': 'Mẫu 01' if doc.document_type == '01' else 'Mẫu 02',
-                'pdf_filename': doc.pdf_filename,
-                'create_date': doc.create_date.strftime('%Y-%m-%d %H:%M') if doc.create_date else '',
-                'create_uid': doc.create_uid.name if doc.create_uid else '',
+                'year': year_by_doc[report['document_id'][0]],
+                'substance_name': report['substance_name'],
+                'collected': report['collection_quantity_kg'] or 0,
+                'reused': report['reuse_quantity_kg'] or 0,
+                'recycled': report['recycle_quantity_kg'] or 0,
+                'destroyed': report['disposal_quantity_kg'] or 0,
             })
         return records
 
+    def _get_ocr_history_data(self, documents):
+        """Get OCR extraction history"""
+        rows = documents.read(['year', 'document_type', 'pdf_filename', 'create_date', 'create_uid'])
+        return [{
+            'year': row['year'],
+            'document_type': _OCR_HISTORY_TYPE_LABELS.get(row['document_type'], 'Mẫu 02'),
+            'pdf_filename': row['pdf_filename'],
+            'create_date': row['create_date'].isoformat(sep=' ', timespec='minutes') if row['create_date'] else '',
+            'create_uid': row['create_uid'][1] if row['create_uid'] else '',
+        } for row in rows]
+
     @http.route('/document_extractor/equipment_dashboard_data', type='json', auth='user', methods=['POST'])
     def get_equipment_dashboard_data(self, equipment_type_id=None, year_from=None, year_to=None):
         """
@@ -701,89 +866,67 @@ class ExtractionController(http.Controller):
             equipment_products = EquipmentProduct.search(domain)
             equipment_ownerships = EquipmentOwnership.search(domain)
 
-            # Eager load relations to prevent N+1 queries
-            equipment_products.mapped('document_id.year')
-            equipment_products.mapped('document_id.organization_id')
-            equipment_products.mapped('substance_id.name')
-            equipment_products.mapped('substance_id.gwp')
-            equipment_ownerships.mapped('document_id.year')
-            equipment_ownerships.mapped('document_id.organization_id')
-            equipment_ownerships.mapped('substance_name')
+            # Nothing matches the filters: skip aggregation entirely
+            if not equipment_products and not equipment_ownerships:
+                return {
+                    'error': False,
+                    'equipment_info': {
+                        'name': equipment_type.name,
+                        'description': equipment_type.description or '',
+                        'capacity_range': f"{equipment_type.min_capacity or 0} - {equipment_type.max_capacity or 0} kW",
+                        'total_companies': 0,
+                        'common_substances': 'N/A',
+                        'total_capacity': 0,
+                    },
+                    'kpis': {'total_count': 0, 'total_kg': 0, 'total_co2e': 0},
+                    'charts': {'trend_by_year': [], 'by_substance': [], 'by_company': []},
+                    'details': [],
+                }
 
             # Aggregate KPIs
             total_count = len(equipment_products) + len(equipment_ownerships)
 
-            # Only count equipment.product
-            total_kg = 0  # substance_quantity_per_unit is now Char (2025-12-18)
-            # for eq in equipment_products:
-            #     total_kg += (eq.substance_quantity_per_unit or 0) * (eq.quantity or 0)
-            # equipment.ownership calculation removed (refill fields are now Char)
-
             # Capacity is Char field, try to parse or skip
             total_capacity = 0  # Skip for now as it's Char type
             # avg_refill_freq removed (refill_frequency is now Char)
 
-            # Pre-fetch all substances to avoid N+1 queries
-            all_substance_names = set()
-            all_substance_names.update(equipment_products.mapped('substance_name'))
-            all_substance_names.update(equipment_ownerships.mapped('substance_name'))
-            # Remove None/empty strings
-            all_substance_names = {name for name in all_substance_names if name}
-
-            substances = request.env['controlled.substance'].sudo().search([
-                ('name', 'in', list(all_substance_names))
-            ])
-            # Build lookup dictionary
-            gwp_by_name = {s.name: s.gwp for s in substances}
-
-            # GWP calculation
-            total_co2e = 0  # substance_quantity_per_unit is now Char (2025-12-18)
-            # for eq in equipment_products:
-            #     gwp = gwp_by_name.get(eq.substance_name, 0)
-            #     kg = (eq.substance_quantity_per_unit or 0) * (eq.quantity or 0)
-            #     total_co2e += kg * gwp / 1000  # Convert to tons
-            # equipment.ownership CO2e calculation removed (refill fields are now Char)
-
-            # Charts data
-            # Trend by year
-            trend_by_year = {}
-            for eq in equipment_products:
-                year = eq.document_id.year
-                if year not in trend_by_year:
-                    trend_by_year[year] = 0
-                trend_by_year[year] += 1
-            for eq in equipment_ownerships:
-                year = eq.document_id.year
-                if year not in trend_by_year:
-                    trend_by_year[year] = 0
-                trend_by_year[year] += 1
-
-            # By substance
-            by_substance = {}  # substance_quantity_per_unit is now Char (2025-12-18)
-            # for eq in equipment_products:
-            #     substance = eq.substance_name
-            #     if substance not in by_substance:
-            #         by_substance[substance] = 0
-            #     kg = (eq.substance_quantity_per_unit or 0) * (eq.quantity or 0)
-            #     by_substance[substance] += kg
-            # equipment.ownership removed from by_substance (refill fields are now Char)
-
-            # By company
-            by_company = {}
-            for eq in equipment_products:
-                org = eq.document_id.organization_id.name
-                if org not in by_company:
-                    by_company[org] = {'capacity': 0, 'count': 0}
-                by_company[org]['count'] += 1
-            for eq in equipment_ownerships:
-                org = eq.document_id.organization_id.name
-                if org not in by_company:
-                    by_company[org] = {'capacity': 0, 'count': 0}
-                by_company[org]['count'] += 1
+            # Equipment line counts per (year, company, substance), grouped in PostgreSQL
+            cr = request.env.cr
+            cr.execute("""
+                SELECT COALESCE(d.year, 0), d.organization_id, p.name, eq.substance_name, COUNT(*)
+                FROM (
+                    SELECT document_id, substance_name FROM equipment_product WHERE id = ANY(%s)
+                    UNION ALL
+                    SELECT document_id, substance_name FROM equipment_ownership WHERE id = ANY(%s)
+                ) eq
+                JOIN document_extraction d ON d.id = eq.document_id
+                LEFT JOIN res_partner p ON p.id = d.organization_id
+                GROUP BY 1, 2, 3, 4
+                ORDER BY 3
+            """, (equipment_products.ids, equipment_ownerships.ids))
+
+            # Single pass: trend by year, by company, unique companies/substances
+            trend_by_year = defaultdict(int)
+            by_company = defaultdict(lambda: {'capacity': 0, 'count': 0})
+            unique_companies = set()
+            unique_substances = set()
+            for year, org_id, org, substance, count in cr.fetchall():
+                trend_by_year[year] += count
+                by_company[org or False]['count'] += count
+                if org_id:
+                    unique_companies.add(org_id)
+                if substance:
+                    unique_substances.add(substance)
+
+            # Quantity KPIs and by-substance chart stay empty:
+            # substance_quantity_per_unit and the refill fields are now Char (2025-12-18)
+            total_kg = 0
+            total_co2e = 0
+            by_substance = defaultdict(int)
 
             # Equipment details
             details = []
-            for eq in equipment_ownerships:
+            for eq in equipment_ownerships[:_DASHBOARD_DETAILS_LIMIT]:
                 details.append({
                     'organization_name': eq.document_id.organization_id.name,
                     'year_start': eq.start_year or '',
@@ -794,20 +937,6 @@ class ExtractionController(http.Controller):
                     'refill_frequency': eq.refill_frequency or '',
                 })
 
-            # Get unique companies and substances
-            unique_companies = set()
-            unique_substances = set()
-            for eq in equipment_products:
-                if eq.document_id.organization_id:
-                    unique_companies.add(eq.document_id.organization_id.id)
-                if eq.substance_name:
-                    unique_substances.add(eq.substance_name)
-            for eq in equipment_ownerships:
-                if eq.document_id.organization_id:
-                    unique_companies.add(eq.document_id.organization_id.id)
-                if eq.substance_name:
-                    unique_substances.add(eq.substance_name)
-
             return {
                 'error': False,
                 'equipment_info': {
@@ -815,7 +944,7 @@ class ExtractionController(http.Controller):
                     'description': equipment_type.description or '',
                     'capacity_range': f"{equipment_type.min_capacity or 0} - {equipment_type.max_capacity or 0} kW",
                     'total_companies': len(unique_companies),
-                    'common_substances': ', '.join(list(unique_substances)[:5]) if unique_substances else 'N/A',
+                    'common_substances': ', '.join(islice(unique_substances, 5)) if unique_substances else 'N/A',
                     'total_capacity': total_capacity,
                 },
                 'kpis': {
@@ -829,7 +958,7 @@ class ExtractionController(http.Controller):
                     'by_substance': [{'substance': k, 'total_kg': v} for k, v in by_substance.items()],
                     'by_company': [{'company': k, 'capacity': v['capacity'], 'count': v['count']} for k, v in by_company.items()],
                 },
-                'details': details[:100],  # Limit to 100 records
+                'details': details,
             }
 
         except Exception as e:
@@ -928,15 +1057,15 @@ class ExtractionController(http.Controller):
 
             documents = Document.search(domain)
 
-            # Eager load relations to prevent N+1 queries
-            documents.mapped('collection_recycling_ids.activity_type')
-            documents.mapped('collection_recycling_ids.quantity_kg')
-            documents.mapped('collection_recycling_ids.substance_name')
-            documents.mapped('collection_recycling_report_ids.collection_quantity_kg')
-            documents.mapped('collection_recycling_report_ids.reuse_quantity_kg')
-            documents.mapped('collection_recycling_report_ids.recycle_quantity_kg')
-            documents.mapped('collection_recycling_report_ids.disposal_quantity_kg')
-            documents.mapped('organization_id.name')
+            # Nothing matches the filters: skip aggregation entirely
+            if not documents:
+                return {
+                    'error': False,
+                    'info': {'total_companies': 0, 'main_substances': 'N/A', 'year_range': 'N/A'},
+                    'kpis': {'total_collected': 0, 'total_reused': 0, 'total_recycled': 0, 'total_destroyed': 0},
+                    'charts': {'trend_by_year': [], 'reuse_by_substance': [], 'recycle_by_technology': []},
+                    'details': [],
+                }
 
             # Aggregate KPIs
             # Form 01: collection.recycling with activity_type
@@ -945,83 +1074,76 @@ class ExtractionController(http.Controller):
             total_recycled = 0
             total_destroyed = 0
 
-            for doc in documents.filtered(lambda d: d.document_type == '01'):
+            # Collected quantity trend by year and reuse by substance,
+            # filled in the same pass as the KPIs
+            trend_by_year = dict.fromkeys(documents.mapped('year'), 0)
+            reuse_by_substance = defaultdict(int)
+
+            # Split documents by form once
+            docs_by_type = documents.grouped('document_type')
+            form01_docs = docs_by_type.get('01', Document.browse())
+            form02_docs = docs_by_type.get('02', Document.browse())
+
+            # Substances across both forms, for the main substances info
+            all_substances = set()
+
+            for doc in form01_docs:
+                year = doc.year
                 for record in doc.collection_recycling_ids:
-                    if record.activity_type == 'collection':
-                        total_collected += record.quantity_kg or 0
-                    elif record.activity_type == 'reuse':
-                        total_reused += record.quantity_kg or 0
-                    elif record.activity_type == 'recycle':
-                        total_recycled += record.quantity_kg or 0
-                    elif record.activity_type == 'disposal':
-                        total_destroyed += record.quantity_kg or 0
+                    activity_type = record.activity_type
+                    quantity = record.quantity_kg or 0
+                    substance = record.substance_name
+                    if substance:
+                        all_substances.add(substance)
+                    if activity_type == 'collection':
+                        total_collected += quantity
+                        trend_by_year[year] += quantity
+                    elif activity_type == 'reuse':
+                        total_reused += quantity
+                        reuse_by_substance[substance] += quantity
+                    elif activity_type == 'recycle':
+                        total_recycled += quantity
+                    elif activity_type == 'disposal':
+                        total_destroyed += quantity
 
             # Form 02: collection.recycling.report has separate fields
-            for doc in documents.filtered(lambda d: d.document_type == '02'):
+            # (Form 01 has no technology field, so recycle by technology is Form 02 only)
+            recycle_by_technology = defaultdict(int)
+            for doc in form02_docs:
+                year = doc.year
                 for report in doc.collection_recycling_report_ids:
-                    total_collected += report.collection_quantity_kg or 0
-                    total_reused += report.reuse_quantity_kg or 0
-                    total_recycled += report.recycle_quantity_kg or 0
+                    collected = report.collection_quantity_kg or 0
+                    reused = report.reuse_quantity_kg or 0
+                    recycled = report.recycle_quantity_kg or 0
+                    total_collected += collected
+                    total_reused += reused
+                    total_recycled += recycled
                     total_destroyed += report.disposal_quantity_kg or 0
-
-            # Charts
-            # Trend by year
-            trend_by_year = {}
-            for doc in documents:
-                year = doc.year
-                if year not in trend_by_year:
-                    trend_by_year[year] = 0
-
-                # Form 01
-                if doc.document_type == '01':
-                    collected = sum(doc.collection_recycling_ids.filtered(lambda r: r.activity_type == 'collection').mapped('quantity_kg'))
-                    trend_by_year[year] += collected
-                # Form 02
-                else:
-                    collected = sum(doc.collection_recycling_report_ids.mapped('collection_quantity_kg'))
                     trend_by_year[year] += collected
 
-            # By substance (reuse)
-            reuse_by_substance = {}
-            for doc in documents:
-                # Form 01
-                if doc.document_type == '01':
-                    for record in doc.collection_recycling_ids.filtered(lambda r: r.activity_type == 'reuse'):
-                        substance = record.substance_name
-                        if substance not in reuse_by_substance:
-                            reuse_by_substance[substance] = 0
-                        reuse_by_substance[substance] += record.quantity_kg or 0
-                # Form 02
-                else:
-                    for report in doc.collection_recycling_report_ids:
-                        substance = report.substance_name
-                        if substance not in reuse_by_substance:
-                            reuse_by_substance[substance] = 0
-                        reuse_by_substance[substance] += report.reuse_quantity_kg or 0
+                    substance = report.substance_name
+                    if substance:
+                        all_substances.add(substance)
+                    reuse_by_substance[substance] += reused
 
-            # By technology (recycle)
-            recycle_by_technology = {}
-            for doc in documents:
-                # Form 01 - no technology field in collection.recycling
-                # Form 02 - collection.recycling.report has recycle_technology
-                if doc.document_type == '02':
-                    for report in doc.collection_recycling_report_ids:
-                        tech = report.recycle_technology or 'Unknown'
-                        if tech not in recycle_by_technology:
-                            recycle_by_technology[tech] = 0
-                        recycle_by_technology[tech] += report.recycle_quantity_kg or 0
+                    tech = report.recycle_technology or 'Unknown'
+                    recycle_by_technology[tech] += recycled
 
-            # Details
+            # Details (stop once the displayed limit is reached)
             details = []
             for doc in documents:
+                if len(details) >= _DASHBOARD_DETAILS_LIMIT:
+                    break
+                org_name = doc.organization_id.name
                 # Form 01 - group by substance
                 if doc.document_type == '01':
                     substance_details = {}
                     for record in doc.collection_recycling_ids:
                         substance = record.substance_name
-                        if substance not in substance_details:
-                            substance_details[substance] = {
-                                'organization_name': doc.organization_id.name,
+                        row = substance_details.get(substance)
+                        if row is None:
+                            row = substance_details[substance] = {
+                                'organization_name': org_name,
                                 'substance_name': substance,
                                 'collected': 0,
                                 'reused': 0,
@@ -1030,21 +1152,18 @@ class ExtractionController(http.Controller):
                                 'technology': '',
                                 'location': '',
                             }
-                        if record.activity_type == 'collection':
-                            substance_details[substance]['collected'] += record.quantity_kg or 0
-                        elif record.activity_type == 'reuse':
-                            substance_details[substance]['reused'] += record.quantity_kg or 0
-                        elif record.activity_type == 'recycle':
-                            substance_details[substance]['recycled'] += record.quantity_kg or 0
-                        elif record.activity_type == 'disposal':
-                            substance_details[substance]['destroyed'] += record.quantity_kg or 0
+                        column = _ACTIVITY_TYPE_COLUMNS.get(record.activity_type)
+                        if column:
+                            row[column] += record.quantity_kg or 0
                     details.extend(substance_details.values())
 
                 # Form 02
                 else:
                     for report in doc.collection_recycling_report_ids:
+                        if len(details) >= _DASHBOARD_DETAILS_LIMIT:
+                            break
                         details.append({
-                            'organization_name': doc.organization_id.name,
+                            'organization_name': org_name,
                             'substance_name': report.substance_name,
                             'collected': report.collection_quantity_kg or 0,
                             'reused': report.reuse_quantity_kg or 0,
@@ -1054,25 +1173,20 @@ class ExtractionController(http.Controller):
                             'location': report.collection_location or '',
                         })
 
-            # Get main substances from both Form 01 and Form 02
-            all_substances = set()
-            for doc in documents:
-                if doc.document_type == '01':
-                    all_substances.update(list(doc.collection_recycling_ids.mapped('substance_name')))
-                else:
-                    all_substances.update(list(doc.collection_recycling_report_ids.mapped('substance_name')))
-
-            # Remove empty strings and take first 5
-            main_substances_list = [s for s in all_substances if s][:5]
+            # Main substances (collected in the KPI loops above), first 5
+            main_substances_list = list(all_substances)[:5]
             main_substances = ', '.join(main_substances_list) if main_substances_list else 'N/A'
 
-            years = documents.mapped('year')
-            year_range = f"{min(years)} - {max(years)}" if years else 'N/A'
+            # Year range and company count in one aggregate query
+            [(year_min, year_max, total_companies)] = Document._read_group(
+                domain, aggregates=['year:min', 'year:max', 'organization_id:count_distinct'],
+            )
+            year_range = f"{year_min} - {year_max}" if year_min else 'N/A'
 
             return {
                 'error': False,
                 'info': {
-                    'total_companies': len(set(documents.mapped('organization_id'))),
+                    'total_companies': total_companies,
                     'main_substances': main_substances,
                     'year_range': year_range,
                 },
@@ -1087,7 +1201,7 @@ class ExtractionController(http.Controller):
                     'reuse_by_substance': [{'substance': k, 'reused': v} for k, v in reuse_by_substance.items()],
                     'recycle_by_technology': [{'technology': k, 'recycled': v} for k, v in recycle_by_technology.items()],
                 },
-                'details': details[:100],
+                'details': details[:_DASHBOARD_DETAILS_LIMIT],
             }
 
         except Exception as e:
@@ -1096,6 +1210,97 @@ class ExtractionController(http.Controller):
 
     # ===== HFC DASHBOARD AGGREGATION HELPERS =====
 
+    def _hfc_usage_rows(self, data):
+        """
+        Flatten the non-title usage lines of the HFC dashboard documents
+
+        Documents, Form 01 substance.usage and Form 02 quota.usage lines are
+        pulled with one read()/search_read() each instead of walking the
+        recordsets in every aggregation. The rows are memoized in data so
+        all dashboard aggregations share them.
+
+        Args:
+            data (dict): {documents, substance_filter_ids, filters}
+
+        Returns:
+            list: [
+                {
+                    doc_id, year, document_type, state, org_id, org_name,
+                    substance_id, substance_name, usage_type, total_kg, co2e
+                },
+                ...
+            ]
+            Documents in data order, lines of each document in their _order
+        """
+        if 'usage_rows' in data:
+            return data['usage_rows']
+
+        documents = data['documents']
+        substance_filter_ids = data['substance_filter_ids']
+        env = documents.env
+
+        doc_rows = documents.read(['year', 'document_type', 'state', 'organization_id'])
+        org_names = {org.id: org.name or '' for org in documents.organization_id}
+
+        line_domain = [('is_title', '=', False)]
+        if substance_filter_ids:
+            line_domain.append(('substance_id', 'in', substance_filter_ids))
+
+        lines_by_doc = defaultdict(list)
+
+        # Form 01: substance_usage_ids, all 3 years summed
+        form01_ids = [row['id'] for row in doc_rows if row['document_type'] == '01']
+        for line in env['substance.usage'].search_read(
+            [('document_id', 'in', form01_ids)] + line_domain,
+            ['document_id', 'substance_id', 'usage_type',
+             'year_1_quantity_kg', 'year_2_quantity_kg', 'year_3_quantity_kg',
+             'year_1_quantity_co2', 'year_2_quantity_co2', 'year_3_quantity_co2'],
+        ):
+            lines_by_doc[line['document_id'][0]].append((
+                line['substance_id'],
+                line['usage_type'],
+                (line['year_1_quantity_kg'] or 0.0) +
+                (line['year_2_quantity_kg'] or 0.0) +
+                (line['year_3_quantity_kg'] or 0.0),
+                (line['year_1_quantity_co2'] or 0.0) +
+                (line['year_2_quantity_co2'] or 0.0) +
+                (line['year_3_quantity_co2'] or 0.0),
+            ))
+
+        # Form 02: quota usage
+        form02_ids = [row['id'] for row in doc_rows if row['document_type'] == '02']
+        for line in env['quota.usage'].search_read(
+            [('document_id', 'in', form02_ids)] + line_domain,
+            ['document_id', 'substance_id', 'usage_type', 'total_quota_kg', 'total_quota_co2'],
+        ):
+            lines_by_doc[line['document_id'][0]].append((
+                line['substance_id'],
+                line['usage_type'],
+                line['total_quota_kg'] or 0.0,
+                line['total_quota_co2'] or 0.0,
+            ))
+
+        usage_rows = []
+        for doc in doc_rows:
+            org_id = doc['organization_id'][0] if doc['organization_id'] else False
+            for substance, usage_type, total_kg, co2e in lines_by_doc.get(doc['id'], ()):
+                usage_rows.append({
+                    'doc_id': doc['id'],
+                    'year': doc['year'],
+                    'document_type': doc['document_type'],
+                    'state': doc['state'],
+                    'org_id': org_id,
+                    'org_name': org_names.get(org_id, ''),
+                    'substance_id': substance[0] if substance else False,
+                    'substance_name': substance[1] if substance else False,
+                    'usage_type': usage_type,
+                    'total_kg': total_kg,
+                    'co2e': co2e,
+                })
+
+        data['usage_rows'] = usage_rows
+        return usage_rows
+
     def _aggregate_dashboard_kpis(self, data):
         """
         Aggregate KPIs from filtered documents
@@ -1118,11 +1323,10 @@ class ExtractionController(http.Controller):
             }
         """
         documents = data['documents']
-        substance_filter_ids = data['substance_filter_ids']
         filters = data['filters']
 
         # KPI 1: Total unique organizations
-        total_organizations = len(set(documents.mapped('organization_id').ids))
+        total_organizations = len(documents.organization_id)
 
         # KPI 2 & 3: Total kg and CO2e
         total_kg = 0.0
@@ -1130,47 +1334,14 @@ class ExtractionController(http.Controller):
         quantity_min = filters.get('quantity_min')
         quantity_max = filters.get('quantity_max')
 
-        for doc in documents:
-            doc_kg = 0.0
-            doc_co2e = 0.0
-
-            if doc.document_type == '01':
-                # Form 01: substance_usage_ids (single field)
-                for usage in doc.substance_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
-
-                    # Sum all 3 years
-                    qty = (usage.year_1_quantity_kg or 0.0) + \
-                          (usage.year_2_quantity_kg or 0.0) + \
-                          (usage.year_3_quantity_kg or 0.0)
-
-                    co2e = (usage.year_1_quantity_co2 or 0.0) + \
-                           (usage.year_2_quantity_co2 or 0.0) + \
-                           (usage.year_3_quantity_co2 or 0.0)
-
-                    doc_kg += qty
-                    doc_co2e += co2e
-
-            elif doc.document_type == '02':
-                # Form 02: quota usage
-                for usage in doc.quota_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
-
-                    qty = usage.total_quota_kg or 0.0
-                    co2e = usage.total_quota_co2 or 0.0
-
-                    doc_kg += qty
-                    doc_co2e += co2e
+        # Per-document totals first, quantity filters apply at document level
+        doc_totals = {}
+        for row in self._hfc_usage_rows(data):
+            totals = doc_totals.setdefault(row['doc_id'], [0.0, 0.0])
+            totals[0] += row['total_kg']
+            totals[1] += row['co2e']
 
-            # Apply quantity filters at document level
+        for doc_kg, doc_co2e in doc_totals.values():
             if quantity_min is not None and doc_kg < quantity_min:
                 continue
             if quantity_max is not None and doc_kg > quantity_max:
@@ -1184,31 +1355,35 @@ class ExtractionController(http.Controller):
         validated_docs = len(documents.filtered(lambda d: d.state == 'validated'))
         verified_percentage = (validated_docs / total_docs * 100.0) if total_docs > 0 else 0.0
 
-        # KPI 5: Quota utilization (Form 02 only)
-        total_allocated = 0.0
-        total_used = 0.0
-        for doc in documents.filtered(lambda d: d.document_type == '02'):
-            for usage in doc.quota_usage_ids:
-                if usage.is_title:
-                    continue
-                total_allocated += usage.allocated_quota_kg or 0.0
-                total_used += usage.total_quota_kg or 0.0
+        # Split documents by form once for KPIs 5 and 6
+        docs_by_type = documents.grouped('document_type')
+        form01_docs = docs_by_type.get('01', documents.browse())
+        form02_docs = docs_by_type.get('02', documents.browse())
+
+        # KPI 5: Quota utilization (Form 02 only, all substances), summed in PostgreSQL
+        [(total_allocated, total_used)] = documents.env['quota.usage']._read_group(
+            [('document_id', 'in', form02_docs.ids), ('is_title', '=', False)],
+            aggregates=['allocated_quota_kg:sum', 'total_quota_kg:sum'],
+        )
+        total_allocated = total_allocated or 0.0
+        total_used = total_used or 0.0
         quota_utilization = (total_used / total_allocated * 100.0) if total_allocated > 0 else 0.0
 
-        # KPI 6: Collection/Recycling total (Form 01 + 02)
-        total_eol = 0.0
+        # KPI 6: Collection/Recycling total (Form 01 + 02), summed in PostgreSQL
         # Form 01: collection.recycling with activity_type
-        for doc in documents.filtered(lambda d: d.document_type == '01'):
-            for record in doc.collection_recycling_ids:
-                if not record.is_title:
-                    total_eol += record.quantity_kg or 0.0
+        [(total_eol_form01,)] = documents.env['collection.recycling']._read_group(
+            [('document_id', 'in', form01_docs.ids), ('is_title', '=', False)],
+            aggregates=['quantity_kg:sum'],
+        )
         # Form 02: collection.recycling.report has separate fields
-        for doc in documents.filtered(lambda d: d.document_type == '02'):
-            for report in doc.collection_recycling_report_ids:
-                total_eol += (report.collection_quantity_kg or 0.0) + \
-                             (report.reuse_quantity_kg or 0.0) + \
-                             (report.recycle_quantity_kg or 0.0) + \
-                             (report.disposal_quantity_kg or 0.0)
+        [report_sums] = documents.env['collection.recycling.report']._read_group(
+            [('document_id', 'in', form02_docs.ids)],
+            aggregates=[
+                'collection_quantity_kg:sum', 'reuse_quantity_kg:sum',
+                'recycle_quantity_kg:sum', 'disposal_quantity_kg:sum',
+            ],
+        )
+        total_eol = (total_eol_form01 or 0.0) + sum(value or 0.0 for value in report_sums)
 
         return {
             'total_organizations': total_organizations,
@@ -1233,62 +1408,13 @@ class ExtractionController(http.Controller):
             ]
             Sorted by year ASC, substance_name ASC
         """
-        documents = data['documents']
-        substance_filter_ids = data['substance_filter_ids']
-
         # Group by (year, substance_id, substance_name)
-        trend_groups = {}
-
-        for doc in documents:
-            year = doc.year
-
-            if doc.document_type == '01':
-                # Form 01: substance_usage_ids (single field)
-                for usage in doc.substance_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
-
-                    substance = usage.substance_id
-                    key = (year, substance.id, substance.name)
-
-                    if key not in trend_groups:
-                        trend_groups[key] = {'total_kg': 0.0, 'co2e': 0.0}
-
-                    # Sum all 3 years
-                    qty = (usage.year_1_quantity_kg or 0.0) + \
-                          (usage.year_2_quantity_kg or 0.0) + \
-                          (usage.year_3_quantity_kg or 0.0)
-
-                    co2e = (usage.year_1_quantity_co2 or 0.0) + \
-                           (usage.year_2_quantity_co2 or 0.0) + \
-                           (usage.year_3_quantity_co2 or 0.0)
-
-                    trend_groups[key]['total_kg'] += qty
-                    trend_groups[key]['co2e'] += co2e
-
-            elif doc.document_type == '02':
-                # Form 02: quota usage
-                for usage in doc.quota_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
-
-                    substance = usage.substance_id
-                    key = (year, substance.id, substance.name)
-
-                    if key not in trend_groups:
-                        trend_groups[key] = {'total_kg': 0.0, 'co2e': 0.0}
+        trend_groups = defaultdict(lambda: {'total_kg': 0.0, 'co2e': 0.0})
 
-                    qty = usage.total_quota_kg or 0.0
-                    co2e = usage.total_quota_co2 or 0.0
-
-                    trend_groups[key]['total_kg'] += qty
-                    trend_groups[key]['co2e'] += co2e
+        for row in self._hfc_usage_rows(data):
+            group = trend_groups[row['year'], row['substance_id'], row['substance_name']]
+            group['total_kg'] += row['total_kg']
+            group['co2e'] += row['co2e']
 
         # Convert to list and sort
         result = []
@@ -1320,9 +1446,6 @@ class ExtractionController(http.Controller):
             ]
             Sorted by total_kg DESC
         """
-        documents = data['documents']
-        substance_filter_ids = data['substance_filter_ids']
-
         # Activity type labels for Form 02
         ACTIVITY_TYPE_LABELS = {
             'production': 'Sản xuất',
@@ -1330,48 +1453,25 @@ class ExtractionController(http.Controller):
             'export': 'Xuất khẩu',
         }
 
-        # Group by activity label
-        activity_groups = {}
-
-        for doc in documents:
-            if doc.document_type == '01':
-                # Form 01: substance_usage_ids (single field)
-                # Activity type determined by is_title pattern (usage_type field)
-                for usage in doc.substance_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
+        # Sum by raw (document_type, usage_type) first, labels are resolved
+        # once per distinct pair below instead of once per row
+        usage_totals = defaultdict(float)
 
-                    # Map usage_type to label
-                    label = ACTIVITY_TYPE_LABELS.get(usage.usage_type, usage.usage_type or 'Khác')
+        for row in self._hfc_usage_rows(data):
+            usage_totals[row['document_type'], row['usage_type']] += row['total_kg']
 
-                    if label not in activity_groups:
-                        activity_groups[label] = 0.0
-
-                    # Sum all 3 years
-                    qty = (usage.year_1_quantity_kg or 0.0) + \
-                          (usage.year_2_quantity_kg or 0.0) + \
-                          (usage.year_3_quantity_kg or 0.0)
-
-                    activity_groups[label] += qty
+        # Group by activity label
+        activity_groups = defaultdict(float)
 
-            elif doc.document_type == '02':
+        for (document_type, usage_type), total_kg in usage_totals.items():
+            if document_type == '01':
+                # Form 01: activity type determined by is_title pattern (usage_type field)
+                label = ACTIVITY_TYPE_LABELS.get(usage_type, usage_type or 'Khác')
+            else:
                 # Form 02: Use usage_type field
-                for usage in doc.quota_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
-
-                    label = ACTIVITY_TYPE_LABELS.get(usage.usage_type, usage.usage_type)
-                    if label not in activity_groups:
-                        activity_groups[label] = 0.0
+                label = ACTIVITY_TYPE_LABELS.get(usage_type, usage_type)
 
-                    qty = usage.total_quota_kg or 0.0
-                    activity_groups[label] += qty
+            activity_groups[label] += total_kg
 
         # Convert to list and sort by total_kg DESC
         result = []
@@ -1402,100 +1502,45 @@ class ExtractionController(http.Controller):
             ]
             Top 10 by total_kg DESC
         """
-        documents = data['documents']
-        substance_filter_ids = data['substance_filter_ids']
-
         # Group by (org_id, year, substance_id)
-        # Store: {key: {'total_kg', 'co2e', 'doc': document_record}}
+        # Store: {key: {'total_kg', 'co2e', 'doc_id', 'state'}}
         top_groups = {}
 
         STATE_PRIORITY = {'completed': 3, 'validated': 2, 'draft': 1}
 
-        for doc in documents:
-            year = doc.year
-            org_id = doc.organization_id.id
-            org_name = doc.organization_id.name or ''
+        for row in self._hfc_usage_rows(data):
+            key = (row['org_id'], row['year'], row['substance_id'])
+
+            group = top_groups.get(key)
+            if group is None:
+                group = top_groups[key] = {
+                    'org_id': row['org_id'],
+                    'org_name': row['org_name'],
+                    'substance_id': row['substance_id'],
+                    'substance_name': row['substance_name'],
+                    'year': row['year'],
+                    'total_kg': 0.0,
+                    'co2e': 0.0,
+                    'doc_id': row['doc_id'],  # Track document
+                    'state': row['state'],
+                }
 
-            if doc.document_type == '01':
-                # Form 01: substance_usage_ids (single field)
-                for usage in doc.substance_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
+            group['total_kg'] += row['total_kg']
+            group['co2e'] += row['co2e']
 
-                    substance = usage.substance_id
-                    key = (org_id, year, substance.id)
-
-                    if key not in top_groups:
-                        top_groups[key] = {
-                            'org_id': org_id,
-                            'org_name': org_name,
-                            'substance_id': substance.id,
-                            'substance_name': substance.name,
-                            'year': year,
-                            'total_kg': 0.0,
-                            'co2e': 0.0,
-                            'doc': doc  # Track document
-                        }
-
-                    # Sum all 3 years
-                    qty = (usage.year_1_quantity_kg or 0.0) + \
-                          (usage.year_2_quantity_kg or 0.0) + \
-                          (usage.year_3_quantity_kg or 0.0)
-
-                    co2e = (usage.year_1_quantity_co2 or 0.0) + \
-                           (usage.year_2_quantity_co2 or 0.0) + \
-                           (usage.year_3_quantity_co2 or 0.0)
-
-                    top_groups[key]['total_kg'] += qty
-                    top_groups[key]['co2e'] += co2e
-
-                    # Update doc if higher state priority
-                    current_doc = top_groups[key]['doc']
-                    if STATE_PRIORITY.get(doc.state, 0) > STATE_PRIORITY.get(current_doc.state, 0):
-                        top_groups[key]['doc'] = doc
+            # Update doc if higher state priority
+            if STATE_PRIORITY.get(row['state'], 0) > STATE_PRIORITY.get(group['state'], 0):
+                group['doc_id'] = row['doc_id']
+                group['state'] = row['state']
 
-            elif doc.document_type == '02':
-                # Form 02: quota usage
-                for usage in doc.quota_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
+        # Take the top 10 by total_kg DESC first, so activity tags are only
+        # read for the documents of the rows that are returned
+        top_10 = heapq.nlargest(10, top_groups.values(), key=lambda group: group['total_kg'])
+        top_docs = data['documents'].browse([group['doc_id'] for group in top_10])
+        tags_by_doc = {doc.id: doc.activity_field_ids.mapped('name') for doc in top_docs}
 
-                    substance = usage.substance_id
-                    key = (org_id, year, substance.id)
-
-                    if key not in top_groups:
-                        top_groups[key] = {
-                            'org_id': org_id,
-                            'org_name': org_name,
-                            'substance_id': substance.id,
-                            'substance_name': substance.name,
-                            'year': year,
-                            'total_kg': 0.0,
-                            'co2e': 0.0,
-                            'doc': doc
-                        }
-
-                    qty = usage.total_quota_kg or 0.0
-                    co2e = usage.total_quota_co2 or 0.0
-
-                    top_groups[key]['total_kg'] += qty
-                    top_groups[key]['co2e'] += co2e
-
-                    # Update doc if higher state priority
-                    current_doc = top_groups[key]['doc']
-                    if STATE_PRIORITY.get(doc.state, 0) > STATE_PRIORITY.get(current_doc.state, 0):
-                        top_groups[key]['doc'] = doc
-
-        # Convert to list, extract activity_tags and status, sort, take top 10
         result = []
-        for group in top_groups.values():
-            doc = group['doc']
+        for group in top_10:
             result.append({
                 'organization_id': group['org_id'],
                 'organization_name': group['org_name'],
@@ -1504,15 +1549,10 @@ class ExtractionController(http.Controller):
                 'year': group['year'],
                 'total_kg': group['total_kg'],
                 'co2e': group['co2e'],
-                'activity_tags': doc.activity_field_ids.mapped('name'),
-                'status': doc.state
+                'activity_tags': tags_by_doc[group['doc_id']],
+                'status': group['state']
             })
-
-        # Sort by total_kg DESC
-        result.sort(key=lambda x: x['total_kg'], reverse=True)
-
-        # Take top 10
-        return result[:10]
+        return result
 
     def _aggregate_pivot_data(self, data):
         """
@@ -1533,109 +1573,39 @@ class ExtractionController(http.Controller):
             Year columns are dynamic based on available years
         """
         documents = data['documents']
-        substance_filter_ids = data['substance_filter_ids']
 
         # Detect available years
         available_years = sorted(set(documents.mapped('year'))) if documents else []
 
-        # Group by (org_id, substance_id)
-        # Store: {key: {'org_name', 'substance_name', 'years': {year: kg}, 'total_co2e': float}}
-        pivot_groups = {}
-
-        for doc in documents:
-            org_id = doc.organization_id.id
-            org_name = doc.organization_id.name or ''
-            year = doc.year
-
-            if doc.document_type == '01':
-                # Form 01: substance_usage_ids (single field)
-                for usage in doc.substance_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
-
-                    substance = usage.substance_id
-                    key = (org_id, substance.id)
-
-                    if key not in pivot_groups:
-                        pivot_groups[key] = {
-                            'org_id': org_id,
-                            'org_name': org_name,
-                            'substance_id': substance.id,
-                            'substance_name': substance.name,
-                            'years': {},  # {year: kg}
-                            'total_co2e': 0.0
-                        }
-
-                    # Sum all 3 years
-                    qty = (usage.year_1_quantity_kg or 0.0) + \
-                          (usage.year_2_quantity_kg or 0.0) + \
-                          (usage.year_3_quantity_kg or 0.0)
-
-                    co2e = (usage.year_1_quantity_co2 or 0.0) + \
-                           (usage.year_2_quantity_co2 or 0.0) + \
-                           (usage.year_3_quantity_co2 or 0.0)
-
-                    if year not in pivot_groups[key]['years']:
-                        pivot_groups[key]['years'][year] = 0.0
-                    pivot_groups[key]['years'][year] += qty
-                    pivot_groups[key]['total_co2e'] += co2e
-
-            elif doc.document_type == '02':
-                # Form 02: quota usage
-                for usage in doc.quota_usage_ids:
-                    if usage.is_title:
-                        continue
-                    # Apply substance filter
-                    if substance_filter_ids and usage.substance_id.id not in substance_filter_ids:
-                        continue
-
-                    substance = usage.substance_id
-                    key = (org_id, substance.id)
-
-                    if key not in pivot_groups:
-                        pivot_groups[key] = {
-                            'org_id': org_id,
-                            'org_name': org_name,
-                            'substance_id': substance.id,
-                            'substance_name': substance.name,
-                            'years': {},
-                            'total_co2e': 0.0
-                        }
-
-                    qty = usage.total_quota_kg or 0.0
-                    co2e = usage.total_quota_co2 or 0.0
-
-                    if year not in pivot_groups[key]['years']:
-                        pivot_groups[key]['years'][year] = 0.0
-                    pivot_groups[key]['years'][year] += qty
-                    pivot_groups[key]['total_co2e'] += co2e
-
-        # Convert to list with dynamic year columns
-        result = []
-        for group in pivot_groups.values():
-            row = {
-                'organization_id': group['org_id'],
-                'organization_name': group['org_name'],
-                'substance_id': group['substance_id'],
-                'substance_name': group['substance_name'],
-                'total_co2e': group['total_co2e']
-            }
-
-            # Add year columns
-            for year in available_years:
-                col_name = f'year_{year}_kg'
-                row[col_name] = group['years'].get(year, 0.0)
-
-            result.append(row)
+        # Pivot columns, named once per year
+        year_columns = {year: f'year_{year}_kg' for year in available_years}
+        empty_years = dict.fromkeys(year_columns.values(), 0.0)
+
+        # Fold rows by (org_id, substance_id) straight into the output rows
+        pivot_rows = {}
+
+        for row in self._hfc_usage_rows(data):
+            key = (row['org_id'], row['substance_id'])
+
+            pivot_row = pivot_rows.get(key)
+            if pivot_row is None:
+                pivot_row = pivot_rows[key] = {
+                    'organization_id': row['org_id'],
+                    'organization_name': row['org_name'],
+                    'substance_id': row['substance_id'],
+                    'substance_name': row['substance_name'],
+                    'total_co2e': 0.0,
+                    **empty_years,
+                }
 
-        # Sort by org_name, substance_name (handle None values)
-        result.sort(key=lambda x: (x['organization_name'] or '', x['substance_name'] or ''))
+            pivot_row[year_columns[row['year']]] += row['total_kg']
+            pivot_row['total_co2e'] += row['co2e']
 
-        # Limit to 50
-        return result[:50]
+        # First 50 by org_name, substance_name (handle None values)
+        return heapq.nsmallest(
+            50, pivot_rows.values(),
+            key=lambda x: (x['organization_name'] or '', x['substance_name'] or ''),
+        )
 
     @http.route('/document_extractor/export_hfc_report', type='http', auth='user', methods=['POST'], csrf=False)
     def export_hfc_report(self, filters='{}', **kwargs):
@@ -1648,11 +1618,7 @@ class ExtractionController(http.Controller):
         Returns:
             HTTP response with Excel file attachment
         """
-        import json
         import openpyxl
-        from io import BytesIO
-        from datetime import datetime
-        import os
 
         try:
             # Parse and validate filters
@@ -1944,7 +1910,6 @@ class ExtractionController(http.Controller):
             ]
             self._write_sheet_data(wb, 'HoSo_DoanhNghiep', data_rows)
         """
-        from copy import copy
         from openpyxl.styles import Font
 
         if sheet_name not in workbook.sheetnames:
@@ -2845,11 +2810,9 @@ class ExtractionController(http.Controller):
             recent_activity = []
             for log in logs:
                 # Format relative time
-                from odoo.fields import Datetime
-
                 create_date = log.create_date
                 if create_date:
-                    now = Datetime.now()
+                    now = fields.Datetime.now()
                     diff = now - create_date
 
                     if diff.days > 0:
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Shared helpers for the plain HTTP JSON routes"""
+
+from odoo.http import request
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(payload):
+    """
+    Serialize a payload to JSON bytes, using orjson when installed
+
+    Non-string dict keys (e.g. integer years) are converted to strings,
+    as the stdlib json module does.
+
+    Args:
+        payload: JSON-serializable object
+
+    Returns:
+        bytes: Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload).encode()
+
+
+def json_response(payload):
+    """
+    Build an application/json response from a payload
+
+    Args:
+        payload: JSON-serializable object
+
+    Returns:
+        Response: HTTP response with the serialized payload as body
+    """
+    return request.make_response(json_dumps(payload), headers=[('Content-Type', 'application/json')])
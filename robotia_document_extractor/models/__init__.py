@@ -13,6 +13,7 @@ from . import collection_location
 # Partner Extensions
 from . import res_partner
 from . import res_users
+from . import res_country
 
 # Queue Job Extensions
 from . import queue_job_inherit
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields
+from odoo import api, models, fields, tools
 
 
 class ActivityField(models.Model):
@@ -35,3 +35,46 @@ class ActivityField(models.Model):
     _sql_constraints = [
         ('code_unique', 'UNIQUE(code)', 'The activity field code must be unique!')
     ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env.registry.clear_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if 'code' in vals or 'active' in vals:
+            self.env.registry.clear_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env.registry.clear_cache()
+        return super().unlink()
+
+    @api.model
+    @tools.ormcache()
+    def _get_code_id_map(self):
+        """
+        Map codes of active activity fields to their ids
+
+        Cached per registry and invalidated whenever codes change, so
+        extraction does not query activity.field for every document.
+
+        Returns:
+            frozendict: {code: id}
+        """
+        records = self.sudo().search_read([], ['code'])
+        return tools.frozendict((rec['code'], rec['id']) for rec in records)
+
+    @api.model
+    def _get_ids_by_codes(self, codes):
+        """
+        Resolve activity field codes to ids, skipping unknown codes
+
+        Args:
+            codes (list): Activity field codes
+
+        Returns:
+            list: Matching activity.field ids
+        """
+        code_map = self._get_code_id_map()
+        return [code_map[code] for code in codes if code in code_map]
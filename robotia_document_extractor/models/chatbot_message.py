@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields
+from odoo import models, fields, api, tools
 
 class ChatbotMessage(models.Model):
     """
@@ -8,7 +8,7 @@ class ChatbotMessage(models.Model):
     """
     _name = 'chatbot.message'
     _description = 'Chatbot Message'
-    _order = 'create_date asc'
+    _order = 'id'
 
     conversation_id = fields.Many2one(
         'chatbot.conversation',
@@ -26,5 +26,23 @@ class ChatbotMessage(models.Model):
     content = fields.Text(string='Content', required=True)
 
     # Optional: Store action data if message triggers action
-    action_type = fields.Char(string='Action Type')
+    action_type = fields.Char(
+        string='Action Type',
+        compute='_compute_action_type',
+        store=True,
+        index=True
+    )
     action_data = fields.Json(string='Action Data')
+
+    @api.depends('action_data')
+    def _compute_action_type(self):
+        for record in self:
+            action = record.action_data
+            record.action_type = action.get('type') if isinstance(action, dict) else False
+
+    def init(self):
+        """Composite index serving history reads (conversation_id = ? ORDER BY id)"""
+        tools.create_index(
+            self.env.cr, 'chatbot_message_conversation_id_id_idx',
+            self._table, ['conversation_id', 'id']
+        )
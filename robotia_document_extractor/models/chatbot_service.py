@@ -4,14 +4,25 @@ from odoo import models, api
 import json
 import logging
 
-try:
-    from google import genai
-    from google.genai import types
-except ImportError:
-    raise ValueError("Google Generative AI library not installed.")
-
 _logger = logging.getLogger(__name__)
 
+
+def _import_genai():
+    """
+    Import google-genai on first use instead of at module load, so workers
+    that never serve a chatbot request do not pay for the import.
+
+    Returns:
+        tuple: (genai, types) modules
+    """
+    try:
+        from google import genai
+        from google.genai import types
+    except ImportError:
+        raise ValueError("Google Generative AI library not installed.")
+    return genai, types
+
+
 class ChatbotService(models.AbstractModel):
     """
     AI-powered chatbot service using Google Gemini Chat API
@@ -34,7 +45,7 @@ class ChatbotService(models.AbstractModel):
                 'suggestions': list       # Quick reply suggestions
             }
         """
-        _logger.info(f"Processing chatbot message: {user_message[:50]}...")
+        _logger.info("Processing chatbot message: %s...", user_message[:50])
 
         # 1. Get conversation history
         history = self._get_conversation_history(conversation_id)
@@ -70,6 +81,8 @@ class ChatbotService(models.AbstractModel):
         # Get last 20 messages for context (Gemini can handle it well)
         messages = conversation.message_ids[-20:]
 
+        _genai, types = _import_genai()
+
         history = []
         for msg in messages:
             # Convert to Gemini Chat Content format
@@ -307,6 +320,7 @@ CÁC LOẠI ACTION HỢP LỆ:
             )
 
         # Initialize Gemini client
+        genai, types = _import_genai()
         client = genai.Client(api_key=api_key)
 
         try:
@@ -328,7 +342,7 @@ CÁC LOẠI ACTION HỢP LỆ:
             return response.text
 
         except Exception as e:
-            _logger.error(f"Gemini Chat API error: {str(e)}", exc_info=True)
+            _logger.error("Gemini Chat API error: %s", e, exc_info=True)
 
             # User-friendly error messages
             if 'API_KEY_INVALID' in str(e):
@@ -381,7 +395,7 @@ CÁC LOẠI ACTION HỢP LỆ:
             # Not valid JSON, continue to text parsing
             pass
         except Exception as e:
-            _logger.warning(f"Error parsing JSON response: {str(e)}")
+            _logger.warning("Error parsing JSON response: %s", e)
 
         # Plain text response (most common case)
         # Generate contextual suggestions
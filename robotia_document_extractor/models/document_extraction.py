@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 import json
-import base64
 import logging
 
 from odoo import models, fields, api
@@ -672,7 +671,7 @@ class DocumentExtraction(models.Model):
         current_data = self._serialize_current_data()
 
         # Get PDF binary
-        pdf_binary = base64.b64decode(self.pdf_attachment_id.datas)
+        pdf_binary = self.pdf_attachment_id.raw
 
         # Call verification service
         reanalysis_service = self.env['document.reanalysis.service']
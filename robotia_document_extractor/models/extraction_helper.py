@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import logging
-from odoo import models, api
+from odoo import models, api, fields
 
 _logger = logging.getLogger(__name__)
 
@@ -36,6 +36,42 @@ RELATION_MAPPINGS = {
     'collection_recycling_report': ('collection.recycling.report', 'collection_recycling_report_ids'),
 }
 
+# Scalar extracted keys copied as-is into document.extraction values
+# (None values are skipped - none of these fields has a default)
+VALS_SCALAR_KEYS = (
+    'year', 'year_1', 'year_2', 'year_3',
+    # Organization info
+    'organization_name', 'business_id', 'business_license_date', 'business_license_place',
+    'legal_representative_name', 'legal_representative_position',
+    'contact_person_name', 'contact_address', 'contact_phone', 'contact_fax', 'contact_email',
+)
+
+# Per-form table flags: (key, default when not extracted)
+VALS_FLAG_KEYS = {
+    '01': (
+        ('has_table_1_1', False), ('has_table_1_2', False),
+        ('has_table_1_3', False), ('has_table_1_4', False),
+        ('is_capacity_merged_table_1_2', True), ('is_capacity_merged_table_1_3', True),
+    ),
+    '02': (
+        ('has_table_2_1', False), ('has_table_2_2', False),
+        ('has_table_2_3', False), ('has_table_2_4', False),
+        ('is_capacity_merged_table_2_2', True), ('is_capacity_merged_table_2_3', True),
+    ),
+}
+
+# Per-form One2many table keys in extracted data
+TABLE_KEYS = {
+    '01': ('substance_usage', 'equipment_product', 'equipment_ownership', 'collection_recycling'),
+    '02': ('quota_usage', 'equipment_product_report', 'equipment_ownership_report', 'collection_recycling_report'),
+}
+
+# Per-form One2many tables: extracted key -> document.extraction field
+VALS_TABLE_KEYS = {
+    doc_type: tuple((key, RELATION_MAPPINGS[key][1]) for key in keys)
+    for doc_type, keys in TABLE_KEYS.items()
+}
+
 
 class ExtractionHelper(models.AbstractModel):
     _name = 'extraction.helper'
@@ -150,8 +186,8 @@ class ExtractionHelper(models.AbstractModel):
             _logger.info(f"Selection field '{field_name}' has dynamic values, skipping validation")
             return value
 
-        # Static selection - validate
-        allowed_values = [sel[0] for sel in selection] if selection else []
+        # Static selection - validate (set built once for this call)
+        allowed_values = frozenset(sel[0] for sel in selection or ())
 
         if value in allowed_values:
             return value
@@ -160,7 +196,7 @@ class ExtractionHelper(models.AbstractModel):
         default_value = get_default_value()
         _logger.warning(
             f"Invalid selection value '{value}' for '{field_name}'. "
-            f"Allowed: {allowed_values}. Using default: {default_value}"
+            f"Allowed: {sorted(allowed_values)}. Using default: {default_value}"
         )
         return default_value
 
@@ -489,7 +525,7 @@ class ExtractionHelper(models.AbstractModel):
                 i += 1
 
             # Build One2many commands from cleaned data
-            return [(0, 0, row) for row in cleaned_data]
+            return [fields.Command.create(row) for row in cleaned_data]
 
         # Helper: Normalize sequence fields in One2many commands
         def normalize_sequences(o2m_commands):
@@ -505,60 +541,40 @@ class ExtractionHelper(models.AbstractModel):
             if not o2m_commands:
                 return []
 
-            normalized = []
-            for idx, (op, _, vals) in enumerate(o2m_commands):
-                # Set sequence = (index + 1) * 10
-                vals['sequence'] = (idx + 1) * 10
-                normalized.append((op, _, vals))
+            # vals dicts are updated in place, the command tuples are reused
+            for idx, command in enumerate(o2m_commands, start=1):
+                command[2]['sequence'] = idx * 10
 
-            return normalized
+            return o2m_commands
 
         # Helper: Populate substance IDs
         def populate_substance_ids(table_data, substance_lookup):
             for row in table_data:
-                substance_name = (row.get('substance_name', '') or row.get('hs_code', '') or '').strip()
-                if substance_name and substance_name in substance_lookup:
-                    row['substance_id'] = substance_lookup[substance_name]
+                substance_name = (row.get('substance_name') or row.get('hs_code') or '').strip()
+                substance_id = substance_lookup.get(substance_name)
+                if substance_id:
+                    row['substance_id'] = substance_id
 
         # ========== FUZZY MATCHING FOR SUBSTANCES ==========
-        if document_type == '01':
-            table_keys = ['substance_usage', 'equipment_product', 'equipment_ownership', 'collection_recycling']
-        else:
-            table_keys = ['quota_usage', 'equipment_product_report', 'equipment_ownership_report', 'collection_recycling_report']
+        table_keys = TABLE_KEYS['01' if document_type == '01' else '02']
 
-        # Collect all substance names
-        all_substance_info = []
+        # Collect unique substance names (tables often repeat the same substance),
+        # keeping document order so the HS code fallback is tried deterministically
+        all_substance_info = {}
         for table_key in table_keys:
             table_data = extracted_data.get(table_key, [])
             for row in table_data:
                 substance_name = (row.get('substance_name') or '').strip()
                 hs_code = (row.get('hs_code') or '').strip() or None
                 if substance_name or hs_code:
-                    all_substance_info.append((substance_name or hs_code, hs_code))
+                    all_substance_info[substance_name or hs_code, hs_code] = None
 
-        # Build substance lookup
-        substance_lookup = {}
+        # Build substance lookup (one batched fuzzy search for the whole document)
         fuzzy_matcher = self.env['fuzzy.matcher']
 
         _logger.info(f"Looking up {len(all_substance_info)} substance entries with fuzzy matching")
 
-        for substance_name, hs_code in all_substance_info:
-            if substance_name in substance_lookup:
-                continue
-
-            found_substance = fuzzy_matcher.search_substance_fuzzy(
-                search_term=substance_name,
-                hs_code_term=hs_code
-            )
-
-            if found_substance:
-                substance_lookup[substance_name] = found_substance.id
-                _logger.info(
-                    f"Fuzzy matched: '{substance_name}' (hs_code='{hs_code}') -> "
-                    f"{found_substance.name} (id={found_substance.id})"
-                )
-            else:
-                _logger.warning(f"No match found for substance: '{substance_name}' (hs_code='{hs_code}')")
+        substance_lookup = fuzzy_matcher.search_substances_fuzzy_bulk(all_substance_info)
 
         _logger.info(f"Fuzzy matching complete: Found {len(substance_lookup)} unique substances")
 
@@ -574,14 +590,11 @@ class ExtractionHelper(models.AbstractModel):
 
         country_code = extracted_data.get('contact_country_code')
         if country_code:
-            # Exact search
-            country = self.env['res.country'].search([
-                ('code', '=', country_code.upper())
-            ], limit=1)
+            # Exact match (cached code map)
+            contact_country_id = self.env['res.country']._get_code_id_map().get(country_code.upper(), False)
 
-            if country:
-                contact_country_id = country.id
-                _logger.info(f"Exact match country: code='{country_code}' -> {country.name}")
+            if contact_country_id:
+                _logger.info(f"Exact match country: code='{country_code}' -> id={contact_country_id}")
             else:
                 # Fuzzy fallback
                 country = fuzzy_matcher.search_country_fuzzy(country_code)
@@ -593,15 +606,13 @@ class ExtractionHelper(models.AbstractModel):
 
         state_code = extracted_data.get('contact_state_code')
         if state_code and contact_country_id:
-            # Exact search
-            state = self.env['res.country.state'].search([
-                ('code', '=', state_code.upper()),
-                ('country_id', '=', contact_country_id)
-            ], limit=1)
+            # Exact match (cached code map)
+            contact_state_id = self.env['res.country.state']._get_code_id_map().get(
+                (contact_country_id, state_code.upper()), False
+            )
 
-            if state:
-                contact_state_id = state.id
-                _logger.info(f"Exact match state: code='{state_code}' -> {state.name}")
+            if contact_state_id:
+                _logger.info(f"Exact match state: code='{state_code}' -> id={contact_state_id}")
             else:
                 # Fuzzy fallback
                 state = fuzzy_matcher.search_state_fuzzy(
@@ -619,29 +630,17 @@ class ExtractionHelper(models.AbstractModel):
 
         # ========== BUILD VALUES DICT ==========
         vals = {
+            key: extracted_data[key]
+            for key in VALS_SCALAR_KEYS
+            if extracted_data.get(key) is not None
+        }
+        vals.update({
             'document_type': document_type,
             'pdf_attachment_id': attachment.id,
             'pdf_filename': attachment.name,
-            'year': extracted_data.get('year'),
-            'year_1': extracted_data.get('year_1'),
-            'year_2': extracted_data.get('year_2'),
-            'year_3': extracted_data.get('year_3'),
-
-            # Organization info
-            'organization_name': extracted_data.get('organization_name'),
-            'business_id': extracted_data.get('business_id'),
-            'business_license_date': extracted_data.get('business_license_date'),
-            'business_license_place': extracted_data.get('business_license_place'),
-            'legal_representative_name': extracted_data.get('legal_representative_name'),
-            'legal_representative_position': extracted_data.get('legal_representative_position'),
-            'contact_person_name': extracted_data.get('contact_person_name'),
-            'contact_address': extracted_data.get('contact_address'),
-            'contact_phone': extracted_data.get('contact_phone'),
-            'contact_fax': extracted_data.get('contact_fax'),
-            'contact_email': extracted_data.get('contact_email'),
             'contact_country_id': contact_country_id,
             'contact_state_id': contact_state_id,
-        }
+        })
 
         # Optional fields for cron job
         if file_id:
@@ -654,8 +653,8 @@ class ExtractionHelper(models.AbstractModel):
         # Activity fields (Many2many)
         activity_codes = extracted_data.get('activity_field_codes', [])
         if activity_codes:
-            activity_fields = self.env['activity.field'].search([('code', 'in', activity_codes)])
-            vals['activity_field_ids'] = [(6, 0, activity_fields.ids)]
+            activity_field_ids = self.env['activity.field']._get_ids_by_codes(activity_codes)
+            vals['activity_field_ids'] = [fields.Command.set(activity_field_ids)]
 
         # Organization lookup by business_id
         business_id = extracted_data.get('business_id')
@@ -669,48 +668,13 @@ class ExtractionHelper(models.AbstractModel):
                 _logger.info(f"Found existing organization: {partner.name} (ID: {partner.id})")
             # If not found, organization will be auto-created on save by document.extraction model
 
-        # Form 01 specific
-        if document_type == '01':
-            vals['has_table_1_1'] = extracted_data.get('has_table_1_1', False)
-            vals['has_table_1_2'] = extracted_data.get('has_table_1_2', False)
-            vals['has_table_1_3'] = extracted_data.get('has_table_1_3', False)
-            vals['has_table_1_4'] = extracted_data.get('has_table_1_4', False)
-            vals['is_capacity_merged_table_1_2'] = extracted_data.get('is_capacity_merged_table_1_2', True)
-            vals['is_capacity_merged_table_1_3'] = extracted_data.get('is_capacity_merged_table_1_3', True)
-
-            vals['substance_usage_ids'] = normalize_sequences(
-                build_o2m_commands(extracted_data.get('substance_usage', []))
-            )
-            vals['equipment_product_ids'] = normalize_sequences(
-                build_o2m_commands(extracted_data.get('equipment_product', []))
-            )
-            vals['equipment_ownership_ids'] = normalize_sequences(
-                build_o2m_commands(extracted_data.get('equipment_ownership', []))
-            )
-            vals['collection_recycling_ids'] = normalize_sequences(
-                build_o2m_commands(extracted_data.get('collection_recycling', []))
-            )
+        # Form specific table flags and One2many tables
+        for key, default in VALS_FLAG_KEYS.get(document_type, ()):
+            vals[key] = extracted_data.get(key, default)
 
-        # Form 02 specific
-        elif document_type == '02':
-            vals['has_table_2_1'] = extracted_data.get('has_table_2_1', False)
-            vals['has_table_2_2'] = extracted_data.get('has_table_2_2', False)
-            vals['has_table_2_3'] = extracted_data.get('has_table_2_3', False)
-            vals['has_table_2_4'] = extracted_data.get('has_table_2_4', False)
-            vals['is_capacity_merged_table_2_2'] = extracted_data.get('is_capacity_merged_table_2_2', True)
-            vals['is_capacity_merged_table_2_3'] = extracted_data.get('is_capacity_merged_table_2_3', True)
-
-            vals['quota_usage_ids'] = normalize_sequences(
-                build_o2m_commands(extracted_data.get('quota_usage', []))
-            )
-            vals['equipment_product_report_ids'] = normalize_sequences(
-                build_o2m_commands(extracted_data.get('equipment_product_report', []))
-            )
-            vals['equipment_ownership_report_ids'] = normalize_sequences(
-                build_o2m_commands(extracted_data.get('equipment_ownership_report', []))
-            )
-            vals['collection_recycling_report_ids'] = normalize_sequences(
-                build_o2m_commands(extracted_data.get('collection_recycling_report', []))
+        for table_key, field_name in VALS_TABLE_KEYS.get(document_type, ()):
+            vals[field_name] = normalize_sequences(
+                build_o2m_commands(extracted_data.get(table_key, []))
             )
 
         return vals
@@ -2,7 +2,6 @@
 
 import json
 import logging
-import base64
 import uuid
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
@@ -187,8 +186,8 @@ class ExtractionJob(models.Model):
             # Update state to processing
             self.write({'state': 'processing'})
 
-            # Decode PDF binary (attachment.datas is base64 encoded)
-            pdf_binary = base64.b64decode(self.attachment_id.datas)
+            # Raw PDF bytes (avoids decoding attachment.datas)
+            pdf_binary = self.attachment_id.raw
 
             # Call service orchestrator with job_id and resume support
             result = service.with_context(notify_channel=self.uuid).process_pdf_extraction(
@@ -198,7 +197,8 @@ class ExtractionJob(models.Model):
                 check_rate_limit=False,  # No rate limit for async jobs
                 last_extract_time=None,  # Not applicable for async
                 job_id=self.id,  # Pass job ID for step tracking
-                resume_from_step=retry_from_step  # Resume support
+                resume_from_step=retry_from_step,  # Resume support
+                use_cache=not self.retry_count  # Explicit retries always re-run the AI
             )
 
             # Check result
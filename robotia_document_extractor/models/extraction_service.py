@@ -1,13 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, api
+from odoo import models, api, fields
 from odoo.tools.translate import _
+from datetime import timedelta
+import hashlib
 import json
 import logging
 import tempfile
 import os
 import time
-import base64
 import io
 import fitz  # PyMuPDF
 from google import genai
@@ -22,6 +23,24 @@ _logger = logging.getLogger(__name__)
 GEMINI_POLL_INTERVAL_SECONDS = 2
 GEMINI_MAX_POLL_RETRIES = 30  # 30 * 2s = 60s timeout
 
+# Settings that change what the AI extracts: a recent result is only reused
+# when all of them are unchanged (API keys and retry counts do not matter)
+EXTRACTION_CACHE_CONFIG_PARAMS = (
+    'robotia_document_extractor.extraction_strategy',
+    'robotia_document_extractor.gemini_model',
+    'robotia_document_extractor.gemini_max_output_tokens',
+    'robotia_document_extractor.gemini_temperature',
+    'robotia_document_extractor.gemini_top_p',
+    'robotia_document_extractor.gemini_top_k',
+    'robotia_document_extractor.batch_size_min',
+    'robotia_document_extractor.batch_size_max',
+    'robotia_document_extractor.batch_image_dpi',
+    'robotia_document_extractor.extraction_prompt_form_01',
+    'robotia_document_extractor.extraction_prompt_form_02',
+    'robotia_document_extractor.batch_prompt_form_01',
+    'robotia_document_extractor.batch_prompt_form_02',
+)
+
 # Shared keyword mappings for activity codes
 SUBSTANCE_KEYWORDS = {
     'Sản xuất': 'production',
@@ -59,6 +78,37 @@ TABLE_ACTIVITY_MAPPINGS = {
 }
 
 
+def _extraction_failure(title, message, log=None, attachment=None, extracted_data=None,
+                        kind='danger', rate_limit_exceeded=False):
+    """
+    Build a failed process_pdf_extraction() result
+
+    Args:
+        title (str): Notification title
+        message (str): Notification message
+        log: google.drive.extraction.log record, if already created
+        attachment: ir.attachment record, if already created
+        extracted_data (dict): Extracted data, if extraction got that far
+        kind (str): Notification type ('danger' or 'warning')
+        rate_limit_exceeded (bool): Whether the call was rate limited
+
+    Returns:
+        dict: Result dict with 'success': False and notification params in 'error'
+    """
+    return {
+        'success': False,
+        'extracted_data': extracted_data,
+        'attachment': attachment,
+        'log': log,
+        'error': {
+            'title': title,
+            'message': message,
+            'type': kind,
+        },
+        'rate_limit_exceeded': rate_limit_exceeded,
+    }
+
+
 class DocumentExtractionService(models.AbstractModel):
     """
     AI-powered document extraction service using Google Gemini API
@@ -232,7 +282,7 @@ class DocumentExtractionService(models.AbstractModel):
         """
         Merge selected page attachments (PNG images) into a single PDF
 
-        This helper takes page attachments created by /robotia/pdf_to_images,
+        This helper takes page attachments created by /robotia/pdf_to_images/upload,
         parses page numbers from filenames (page_0.png, page_1.png, ...),
         sorts them in ascending order, and merges them into a single PDF document.
 
@@ -279,8 +329,8 @@ class DocumentExtractionService(models.AbstractModel):
             att = page_data['attachment']
 
             try:
-                # Decode image binary
-                img_binary = base64.b64decode(att.datas)
+                # Read raw image bytes (no base64 round-trip)
+                img_binary = att.raw
 
                 # Open image as document
                 img_doc = fitz.open(stream=img_binary, filetype="png")
@@ -359,7 +409,7 @@ class DocumentExtractionService(models.AbstractModel):
 
     def process_pdf_extraction(self, pdf_binary, filename, document_type,
                                check_rate_limit=True, last_extract_time=None,
-                               job_id=None, resume_from_step=None):
+                               job_id=None, resume_from_step=None, use_cache=True):
         """
         MAIN ORCHESTRATOR: Process PDF extraction with transaction-safe logging
 
@@ -380,6 +430,8 @@ class DocumentExtractionService(models.AbstractModel):
             last_extract_time (float): Unix timestamp of last extraction (for rate limit)
             job_id (int): Optional extraction.job ID for step checkpointing (llama_split only)
             resume_from_step (str): Optional step to resume from (llama_split only)
+            use_cache (bool): Reuse a recent identical extraction of the same user
+                (default: True, pass False for explicit retries)
 
         Returns:
             dict: {
@@ -420,26 +472,26 @@ class DocumentExtractionService(models.AbstractModel):
                 if current_time - last_extract_time < EXTRACTION_RATE_LIMIT_SECONDS:
                     wait_seconds = int(EXTRACTION_RATE_LIMIT_SECONDS - (current_time - last_extract_time)) + 1
                     _logger.warning(f"Rate limit exceeded for {filename}: Please wait {wait_seconds}s")
-                    return {
-                        'success': False,
-                        'extracted_data': None,
-                        'attachment': None,
-                        'log': None,  # No log created when rate limited
-                        'error': {
-                            'title': _('Too Many Requests'),
-                            'message': _('Please wait %(seconds)d seconds before extracting again') % {'seconds': wait_seconds},
-                            'type': 'warning',
-                        },
-                        'rate_limit_exceeded': True
-                    }
+                    return _extraction_failure(
+                        _('Too Many Requests'),
+                        _('Please wait %(seconds)d seconds before extracting again') % {'seconds': wait_seconds},
+                        kind='warning',
+                        rate_limit_exceeded=True,
+                    )
 
             # ===== STEP 2: Create log (AFTER rate limiting check) =====
-            log = self.env['google.drive.extraction.log'].sudo().create({
+            # Cache keys are only computed when results may be reused
+            cache_ttl_minutes = self._get_extraction_cache_ttl() if use_cache and not resume_from_step else 0
+            log_vals = {
                 'drive_file_id': False,  # No Drive ID for manual uploads
                 'file_name': filename,
                 'document_type': document_type,
                 'status': 'processing',
-            })
+            }
+            if cache_ttl_minutes > 0:
+                log_vals['file_sha256'] = hashlib.sha256(pdf_binary).hexdigest()
+                log_vals['extraction_config_hash'] = self._get_extraction_config_hash(document_type)
+            log = self.env['google.drive.extraction.log'].sudo().create(log_vals)
             _logger.info(f"[Log {log.id}] Created log for {filename} (Type: {document_type})")
 
             # ===== STEP 3: File validations =====
@@ -449,18 +501,7 @@ class DocumentExtractionService(models.AbstractModel):
                 error_msg = 'Invalid file type: Only PDF files are allowed'
                 log.write({'status': 'error', 'error_message': error_msg})
                 _logger.warning(f"[Log {log.id}] {error_msg}")
-                return {
-                    'success': False,
-                    'extracted_data': None,
-                    'attachment': None,
-                    'log': log,
-                    'error': {
-                        'title': _('Invalid File Type'),
-                        'message': _('Only PDF files are allowed'),
-                        'type': 'danger',
-                    },
-                    'rate_limit_exceeded': False
-                }
+                return _extraction_failure(_('Invalid File Type'), _('Only PDF files are allowed'), log=log)
 
             # 3.2 Validate file size
             pdf_size_bytes = len(pdf_binary)
@@ -469,43 +510,29 @@ class DocumentExtractionService(models.AbstractModel):
                 error_msg = f'File too large: {pdf_size_mb:.1f}MB (max {MAX_PDF_SIZE_MB}MB)'
                 log.write({'status': 'error', 'error_message': error_msg})
                 _logger.warning(f"[Log {log.id}] {error_msg}")
-                return {
-                    'success': False,
-                    'extracted_data': None,
-                    'attachment': None,
-                    'log': log,
-                    'error': {
-                        'title': _('File Too Large'),
-                        'message': _('File size (%(size).1fMB) exceeds %(max)dMB') % {'size': pdf_size_mb, 'max': MAX_PDF_SIZE_MB},
-                        'type': 'danger',
-                    },
-                    'rate_limit_exceeded': False
-                }
+                return _extraction_failure(
+                    _('File Too Large'),
+                    _('File size (%(size).1fMB) exceeds %(max)dMB') % {'size': pdf_size_mb, 'max': MAX_PDF_SIZE_MB},
+                    log=log,
+                )
 
             # 3.3 Validate PDF magic bytes
             if not pdf_binary.startswith(b'%PDF'):
                 error_msg = 'Invalid PDF format: File does not start with PDF signature'
                 log.write({'status': 'error', 'error_message': error_msg})
                 _logger.warning(f"[Log {log.id}] {error_msg}")
-                return {
-                    'success': False,
-                    'extracted_data': None,
-                    'attachment': None,
-                    'log': log,
-                    'error': {
-                        'title': _('Invalid PDF'),
-                        'message': _('The uploaded file does not appear to be a valid PDF'),
-                        'type': 'danger',
-                    },
-                    'rate_limit_exceeded': False
-                }
+                return _extraction_failure(
+                    _('Invalid PDF'),
+                    _('The uploaded file does not appear to be a valid PDF'),
+                    log=log,
+                )
 
             # ===== STEP 3: Create attachment BEFORE AI call (CRITICAL for logging) =====
             try:
                 attachment = self.env['ir.attachment'].sudo().create({
                     'name': filename,
                     'type': 'binary',
-                    'datas': base64.b64encode(pdf_binary).decode('utf-8'),
+                    'raw': pdf_binary,
                     'res_model': 'document.extraction',
                     'res_id': 0,  # Public for preview
                     'public': True,
@@ -518,30 +545,32 @@ class DocumentExtractionService(models.AbstractModel):
                 error_msg = f'Failed to create attachment: {str(e)}'
                 log.write({'status': 'error', 'error_message': error_msg})
                 _logger.error(f"[Log {log.id}] {error_msg}", exc_info=True)
-                return {
-                    'success': False,
-                    'extracted_data': None,
-                    'attachment': None,
-                    'log': log,
-                    'error': {
-                        'title': _('Upload Failed'),
-                        'message': _('Failed to upload PDF file to server'),
-                        'type': 'danger',
-                    },
-                    'rate_limit_exceeded': False
-                }
+                return _extraction_failure(
+                    _('Upload Failed'),
+                    _('Failed to upload PDF file to server'),
+                    log=log,
+                )
 
-            # ===== STEP 4: AI Extraction =====
+            # ===== STEP 4: AI Extraction (reused for a recent identical upload) =====
+            cached_log = self._find_cached_extraction_log(log, cache_ttl_minutes) if cache_ttl_minutes > 0 else None
             try:
-                _logger.info(f"[Log {log.id}] Starting AI extraction...")
-                extracted_data = self.extract_pdf(
-                    pdf_binary,
-                    document_type,
-                    log_id=log,
-                    job_id=job_id,
-                    resume_from_step=resume_from_step
-                )
-                _logger.info(f"[Log {log.id}] AI extraction completed successfully")
+                if cached_log:
+                    _logger.info(f"[Log {log.id}] Reusing extraction result of log {cached_log.id} (same file)")
+                    extracted_data = json.loads(cached_log.ai_response_json)
+                    log.write({
+                        'ocr_response_json': cached_log.ocr_response_json,
+                        'validation_result_json': cached_log.validation_result_json,
+                    })
+                else:
+                    _logger.info(f"[Log {log.id}] Starting AI extraction...")
+                    extracted_data = self.extract_pdf(
+                        pdf_binary,
+                        document_type,
+                        log_id=log,
+                        job_id=job_id,
+                        resume_from_step=resume_from_step
+                    )
+                    _logger.info(f"[Log {log.id}] AI extraction completed successfully")
             except Exception as e:
                 error_msg = f'AI extraction failed: {str(e)}'
                 error_traceback = traceback.format_exc()
@@ -553,18 +582,7 @@ class DocumentExtractionService(models.AbstractModel):
                 })
                 _logger.error(f"[Log {log.id}] {error_msg}", exc_info=True)
 
-                return {
-                    'success': False,
-                    'extracted_data': None,
-                    'attachment': attachment,
-                    'log': log,
-                    'error': {
-                        'title': _('AI Extraction Failed'),
-                        'message': str(e),
-                        'type': 'danger',
-                    },
-                    'rate_limit_exceeded': False
-                }
+                return _extraction_failure(_('AI Extraction Failed'), str(e), log=log, attachment=attachment)
 
             # ===== STEP 5: Post-processing (auto-calculate years) =====
             try:
@@ -598,18 +616,13 @@ class DocumentExtractionService(models.AbstractModel):
                 except:
                     pass
 
-                return {
-                    'success': False,
-                    'extracted_data': extracted_data,
-                    'attachment': attachment,
-                    'log': log,
-                    'error': {
-                        'title': _('Save Failed'),
-                        'message': _('Extraction succeeded but failed to save results'),
-                        'type': 'danger',
-                    },
-                    'rate_limit_exceeded': False
-                }
+                return _extraction_failure(
+                    _('Save Failed'),
+                    _('Extraction succeeded but failed to save results'),
+                    log=log,
+                    attachment=attachment,
+                    extracted_data=extracted_data,
+                )
 
             # ===== SUCCESS: Return complete result =====
             return {
@@ -637,18 +650,63 @@ class DocumentExtractionService(models.AbstractModel):
                 except Exception as log_error:
                     _logger.error(f"Failed to update log: {log_error}")
 
-            return {
-                'success': False,
-                'extracted_data': None,
-                'attachment': attachment,  # May be None if error before attachment creation
-                'log': log,  # May be None if error before log creation
-                'error': {
-                    'title': _('Unexpected Error'),
-                    'message': str(e),
-                    'type': 'danger',
-                },
-                'rate_limit_exceeded': False
-            }
+            return _extraction_failure(_('Unexpected Error'), str(e), log=log, attachment=attachment)
+
+    def _get_extraction_cache_ttl(self):
+        """
+        Reuse window for identical extractions, in minutes
+
+        Read from robotia_document_extractor.extraction_cache_ttl_minutes
+        (default 60, 0 disables reuse).
+
+        Returns:
+            int: Window in minutes
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        return int(ICP.get_param('robotia_document_extractor.extraction_cache_ttl_minutes', '60'))
+
+    def _get_extraction_config_hash(self, document_type):
+        """
+        Fingerprint of the company and extraction settings a result depends on
+
+        Args:
+            document_type (str): '01' or '02'
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        config = [self.env.company.id, document_type]
+        config.extend(ICP.get_param(key) for key in EXTRACTION_CACHE_CONFIG_PARAMS)
+        return hashlib.sha256(json.dumps(config).encode()).hexdigest()
+
+    def _find_cached_extraction_log(self, log, ttl_minutes):
+        """
+        Find a recent successful extraction of the same file by the same user
+
+        Only logs of the current user with the same document type, company and
+        extraction settings (extraction_config_hash) are reused.
+
+        Args:
+            log: google.drive.extraction.log record of the current extraction
+            ttl_minutes (int): Reuse window in minutes
+
+        Returns:
+            google.drive.extraction.log: Matching log, or an empty recordset
+        """
+        if not log.file_sha256 or not log.extraction_config_hash:
+            return log.browse()
+
+        return log.search([
+            ('id', '!=', log.id),
+            ('create_uid', '=', self.env.uid),
+            ('file_sha256', '=', log.file_sha256),
+            ('extraction_config_hash', '=', log.extraction_config_hash),
+            ('document_type', '=', log.document_type),
+            ('status', '=', 'success'),
+            ('ai_response_json', '!=', False),
+            ('create_date', '>=', fields.Datetime.now() - timedelta(minutes=ttl_minutes)),
+        ], limit=1)
 
     def _build_pdf_from_pages(self, pdf_binary, page_indexes):
         """
@@ -134,6 +134,20 @@ class FuzzyMatcher(models.AbstractModel):
                 _logger.info(f"Normalized code match: '{search_term}' -> {substance.name} (code={substance.code})")
                 return substance
 
+        return self._search_substance_by_hs_or_partial(search_term, hs_code_term)
+
+    @api.model
+    def _search_substance_by_hs_or_partial(self, search_term, hs_code_term=None):
+        """
+        Fallback strategies 3-5 of search_substance_fuzzy (HS code, then partial match)
+
+        Args:
+            search_term (str): Stripped substance name or code
+            hs_code_term (str, optional): HS code from AI extraction
+
+        Returns:
+            recordset: controlled.substance records (may be empty)
+        """
         # Strategy 3 & 4: HS code matching (if provided)
         if hs_code_term:
             normalized_hs = self.normalize_hs_code(hs_code_term)
@@ -195,6 +209,87 @@ class FuzzyMatcher(models.AbstractModel):
         _logger.warning(f"No fuzzy match found for: term='{search_term}', hs_code='{hs_code_term}'")
         return self.env['controlled.substance']
 
+    @api.model
+    def search_substances_fuzzy_bulk(self, substance_info):
+        """
+        Batched search_substance_fuzzy for all substances of a document.
+
+        Strategies 1 and 2 (exact and normalized name/code) are resolved for
+        every term from two searches in total; only terms still unmatched
+        fall back to the per-term HS code and partial match strategies.
+
+        Args:
+            substance_info (iterable): (search_term, hs_code_term) pairs, a term may
+                appear with several hs_code_terms (each is tried until one matches)
+
+        Returns:
+            dict: {search_term: controlled.substance id} for matched terms
+        """
+        Substance = self.env['controlled.substance']
+
+        pending = {}
+        for search_term, hs_code_term in substance_info:
+            search_term = (search_term or '').strip()
+            if search_term:
+                hs_code_terms = pending.setdefault(search_term, [])
+                if hs_code_term not in hs_code_terms:
+                    hs_code_terms.append(hs_code_term)
+        if not pending:
+            return {}
+
+        lookup = {}
+        terms = list(pending)
+
+        # Strategy 1: Exact match on name or code, first record in _order wins
+        exact = {}
+        for row in Substance.search_read([
+            '|',
+            ('name', 'in', terms),
+            ('code', 'in', terms),
+        ], ['name', 'code']):
+            exact.setdefault(row['name'], row)
+            if row['code']:
+                exact.setdefault(row['code'], row)
+
+        for term in terms:
+            row = exact.get(term)
+            if row:
+                lookup[term] = row['id']
+                del pending[term]
+        exact_count = len(lookup)
+
+        # Strategy 2: Normalized name/code match over all substances, loaded once
+        if pending:
+            normalized = {}
+            for row in Substance.with_context(active_test=False).search_read([], ['name', 'code']):
+                normalized.setdefault(self.normalize_substance_code(row['name']), row)
+                if row['code']:
+                    normalized.setdefault(self.normalize_substance_code(row['code']), row)
+
+            for term in list(pending):
+                row = normalized.get(self.normalize_substance_code(term))
+                if row:
+                    lookup[term] = row['id']
+                    del pending[term]
+        normalized_count = len(lookup) - exact_count
+
+        # Strategies 3-5 for the remaining terms
+        for term, hs_code_terms in pending.items():
+            for hs_code_term in hs_code_terms:
+                substance = self._search_substance_by_hs_or_partial(term, hs_code_term)
+                if substance:
+                    lookup[term] = substance.id
+                    break
+
+        # One summary line instead of a log line per matched term;
+        # HS code/partial matches and misses are still logged per term
+        _logger.info(
+            f"Bulk substance match: {exact_count} exact, {normalized_count} normalized, "
+            f"{len(lookup) - exact_count - normalized_count} fallback, "
+            f"{len(terms) - len(lookup)} unmatched"
+        )
+        return lookup
+
     @api.model
     def search_hs_code_fuzzy(self, hs_code_text):
         """
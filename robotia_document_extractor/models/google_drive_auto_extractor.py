@@ -2,7 +2,6 @@
 
 import json
 import time
-import base64
 import logging
 import traceback
 from odoo import api, models
@@ -329,7 +328,7 @@ class GoogleDriveAutoExtractor(models.AbstractModel):
             attachment = self.env['ir.attachment'].create({
                 'name': file_name,
                 'type': 'binary',
-                'datas': base64.b64encode(pdf_binary),
+                'raw': pdf_binary,
                 'res_model': 'document.extraction',
                 'res_id': 0,
                 'public': False,
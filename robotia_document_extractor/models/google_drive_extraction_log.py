@@ -23,6 +23,19 @@ class GoogleDriveExtractionLog(models.Model):
         required=True
     )
 
+    file_sha256 = fields.Char(
+        string='File SHA-256',
+        index=True,
+        readonly=True,
+        help='SHA-256 of the uploaded PDF, used to reuse recent results for identical uploads'
+    )
+
+    extraction_config_hash = fields.Char(
+        string='Extraction Config Hash',
+        readonly=True,
+        help='Fingerprint of the company and extraction settings, a result is only reused when unchanged'
+    )
+
     document_type = fields.Selection([
         ('01', 'Form 01 - Registration'),
         ('02', 'Form 02 - Report')
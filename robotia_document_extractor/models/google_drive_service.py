@@ -2,7 +2,6 @@
 
 import json
 import logging
-import base64
 import io
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
@@ -549,7 +548,7 @@ class GoogleDriveService(models.AbstractModel):
         # Create attachment
         attachment = self.env['ir.attachment'].create({
             'name': file_name,
-            'datas': base64.b64encode(file_content),
+            'raw': file_content,
             'mimetype': mime_type,
             'type': 'binary',
             'google_drive_id': file_id,
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models, tools
+
+
+class ResCountry(models.Model):
+    """Extend res.country with a cached code lookup for extraction"""
+    _inherit = 'res.country'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env.registry.clear_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if 'code' in vals:
+            self.env.registry.clear_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env.registry.clear_cache()
+        return super().unlink()
+
+    @api.model
+    @tools.ormcache()
+    def _get_code_id_map(self):
+        """
+        Map country codes to their ids
+
+        Cached per registry and invalidated whenever codes change, so
+        extraction does not query res.country for every document.
+
+        Returns:
+            frozendict: {code: id}
+        """
+        records = self.sudo().search_read([], ['code'])
+        return tools.frozendict((rec['code'], rec['id']) for rec in records)
+
+
+class ResCountryState(models.Model):
+    """Extend res.country.state with a cached code lookup for extraction"""
+    _inherit = 'res.country.state'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env.registry.clear_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if 'code' in vals or 'country_id' in vals:
+            self.env.registry.clear_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env.registry.clear_cache()
+        return super().unlink()
+
+    @api.model
+    @tools.ormcache()
+    def _get_code_id_map(self):
+        """
+        Map (country id, state code) pairs to state ids
+
+        Cached per registry and invalidated whenever codes change, so
+        extraction does not query res.country.state for every document.
+
+        Returns:
+            frozendict: {(country_id, code): id}
+        """
+        records = self.sudo().search_read([], ['country_id', 'code'])
+        return tools.frozendict(
+            ((rec['country_id'][0], rec['code']), rec['id']) for rec in records
+        )
@@ -1,6 +1,6 @@
 /** @odoo-module **/
 
-import { Component, useState, useRef, onMounted } from "@odoo/owl";
+import { Component, useState, useRef, onMounted, onPatched } from "@odoo/owl";
 import { registry } from "@web/core/registry";
 import { useService } from "@web/core/utils/hooks";
 import { rpc } from "@web/core/network/rpc";
@@ -19,6 +19,13 @@ export class ChatBot extends Component {
         // Track conversation ID for multi-turn chat
         this.conversationId = null;
 
+        // History pagination (cursor = id of the oldest loaded message)
+        this.historyCursor = null;
+        this.hasMoreHistory = false;
+        this.isLoadingHistory = false;
+        // Resolvers waiting for the next DOM patch
+        this.patchWaiters = [];
+
         this.state = useState({
             messages: [],
             inputMessage: "",
@@ -30,6 +37,12 @@ export class ChatBot extends Component {
             ]
         });
 
+        onPatched(() => {
+            const waiters = this.patchWaiters;
+            this.patchWaiters = [];
+            waiters.forEach(resolve => resolve());
+        });
+
         onMounted(async () => {
             // Load conversation ID from localStorage
             const savedConversationId = localStorage.getItem('chatbot_conversation_id');
@@ -149,38 +162,92 @@ export class ChatBot extends Component {
         }
     }
 
+    /**
+     * Load older messages when the user scrolls to the top of the chat
+     */
+    async onMessagesScroll() {
+        const el = this.chatMessages.el;
+        if (!el || el.scrollTop > 0 || !this.hasMoreHistory || this.isLoadingHistory) {
+            return;
+        }
+        // Guard stays set until the scroll position has been restored, so
+        // scroll events in between do not chain further page loads
+        this.isLoadingHistory = true;
+        try {
+            const previousHeight = el.scrollHeight;
+            const previousCount = this.state.messages.length;
+            await this.loadConversationHistory(this.historyCursor);
+            if (this.state.messages.length > previousCount) {
+                // Older messages are only in the DOM once OWL has patched
+                await this.nextPatch();
+                // Keep the previously visible message in place
+                el.scrollTop = el.scrollHeight - previousHeight;
+            }
+        } finally {
+            this.isLoadingHistory = false;
+        }
+    }
+
+    /**
+     * Resolve after the next render of this component has been patched
+     */
+    nextPatch() {
+        return new Promise(resolve => this.patchWaiters.push(resolve));
+    }
+
     /**
      * Load conversation history from backend
+     *
+     * @param {number|null} beforeId - Load the page before this message id,
+     *     or the latest page when null
      */
-    async loadConversationHistory() {
+    async loadConversationHistory(beforeId = null) {
         try {
-            const result = await rpc("/chatbot/conversation/history", {
-                conversation_id: this.conversationId
-            });
+            const params = new URLSearchParams({ conversation_id: this.conversationId });
+            if (beforeId) {
+                params.set('before_id', beforeId);
+            }
+            const response = await fetch(`/chatbot/conversation/history?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const result = await response.json();
 
             if (result.error) {
                 console.warn("Could not load conversation history:", result.error);
-                // Clear invalid conversation ID
-                this.conversationId = null;
-                localStorage.removeItem('chatbot_conversation_id');
+                // Clear invalid conversation ID (initial load only)
+                if (!beforeId) {
+                    this.conversationId = null;
+                    localStorage.removeItem('chatbot_conversation_id');
+                }
                 return;
             }
 
             // Restore messages
-            this.state.messages = result.messages.map(msg => ({
+            const messages = result.messages.map(msg => ({
                 id: msg.id,
                 text: msg.content,
                 role: msg.role,
                 timestamp: new Date(msg.timestamp).getTime(),
                 action: msg.action
             }));
-
-            this.scrollToBottom();
+            this.hasMoreHistory = result.has_more;
+            this.historyCursor = result.next_cursor;
+
+            if (beforeId) {
+                this.state.messages.unshift(...messages);
+            } else {
+                this.state.messages = messages;
+                this.scrollToBottom();
+            }
         } catch (error) {
             console.error("Error loading conversation history:", error);
-            // Clear invalid conversation ID on error
-            this.conversationId = null;
-            localStorage.removeItem('chatbot_conversation_id');
+            // Clear invalid conversation ID on error, but keep the
+            // conversation when only an older page failed to load
+            if (!beforeId) {
+                this.conversationId = null;
+                localStorage.removeItem('chatbot_conversation_id');
+            }
         }
     }
 
@@ -336,4 +403,4 @@ export class ChatBot extends Component {
 }
 
 // Register the ChatBot action
-registry.category("actions").add("document_extractor.chatbot", ChatBot);
+registry.category("actions").add("document_extractor.chatbot", ChatBot, { force: true });
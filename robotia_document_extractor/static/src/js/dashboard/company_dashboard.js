@@ -4,7 +4,6 @@ import { Component, useState, onWillStart, useRef, useEffect } from "@odoo/owl";
 import { registry } from "@web/core/registry";
 import { useService } from "@web/core/utils/hooks";
 import { loadBundle } from "@web/core/assets";
-import { rpc } from "@web/core/network/rpc";
 import {
     CHART_COLORS,
     LINE_CHART_OPTIONS,
@@ -100,10 +99,15 @@ export class CompanyDashboard extends Component {
                 throw new Error('Organization ID is required');
             }
 
-            // Fetch company dashboard data via RPC controller
-            const dashboardData = await rpc('/document_extractor/company_dashboard_data', {
-                organization_id: this.state.organizationId
+            // Fetch company dashboard data (plain JSON GET route)
+            const params = new URLSearchParams({
+                organization_id: this.state.organizationId,
             });
+            const response = await fetch(`/document_extractor/company_dashboard_data?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const dashboardData = await response.json();
 
             // Check for errors in response
             if (dashboardData.error) {
@@ -344,4 +348,4 @@ export class CompanyDashboard extends Component {
 }
 
 // Register the dashboard as a client action
-registry.category("actions").add("document_extractor.company_dashboard", CompanyDashboard);
+registry.category("actions").add("document_extractor.company_dashboard", CompanyDashboard, { force: true });
@@ -283,4 +283,4 @@ export class Dashboard extends Component {
     }
 }
 
-registry.category("actions").add("document_extractor.dashboard", Dashboard);
+registry.category("actions").add("document_extractor.dashboard", Dashboard, { force: true });
@@ -354,4 +354,4 @@ export class EquipmentDashboard extends Component {
 }
 
 // Register the dashboard as a client action
-registry.category("actions").add("document_extractor.equipment_dashboard", EquipmentDashboard);
+registry.category("actions").add("document_extractor.equipment_dashboard", EquipmentDashboard, { force: true });
@@ -582,4 +582,4 @@ export class HfcDashboard extends Component {
 }
 
 // Register as client action
-registry.category("actions").add("document_extractor.hfc_dashboard", HfcDashboard);
+registry.category("actions").add("document_extractor.hfc_dashboard", HfcDashboard, { force: true });
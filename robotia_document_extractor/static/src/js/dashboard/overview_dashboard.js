@@ -374,4 +374,4 @@ export class OverviewDashboard extends Component {
 }
 
 // Register the dashboard as a client action
-registry.category("actions").add("document_extractor.overview_dashboard", OverviewDashboard);
+registry.category("actions").add("document_extractor.overview_dashboard", OverviewDashboard, { force: true });
@@ -349,4 +349,4 @@ export class RecoveryDashboard extends Component {
 }
 
 // Register the dashboard as a client action
-registry.category("actions").add("document_extractor.recovery_dashboard", RecoveryDashboard);
+registry.category("actions").add("document_extractor.recovery_dashboard", RecoveryDashboard, { force: true });
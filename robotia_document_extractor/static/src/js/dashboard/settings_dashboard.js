@@ -62,4 +62,4 @@ export class SettingsDashboard extends Component {
     }
 }
 
-registry.category("actions").add("document_extractor.settings_dashboard", SettingsDashboard);
+registry.category("actions").add("document_extractor.settings_dashboard", SettingsDashboard, { force: true });
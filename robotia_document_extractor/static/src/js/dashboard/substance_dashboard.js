@@ -484,4 +484,4 @@ export class SubstanceDashboard extends Component {
 }
 
 // Register the dashboard as a client action
-registry.category("actions").add("document_extractor.substance_dashboard", SubstanceDashboard);
+registry.category("actions").add("document_extractor.substance_dashboard", SubstanceDashboard, { force: true });
@@ -31,7 +31,7 @@ export class ExtractionPageSelector extends Component {
             selectedPages: new Set(), // Set of attachment IDs
             activePageId: null, // Currently visible page (>50% in viewport)
             isProcessing: false,
-            base64File: null, // Store base64 of the PDF
+            hasFile: false, // Whether the PDF has been uploaded and split
             previewUrl: null, // URL to show in preview modal
             documentType: null, // Document type from upload screen
             // PDF preview for progress_only mode
@@ -115,13 +115,10 @@ export class ExtractionPageSelector extends Component {
             const response = await fetch(fileUrl);
             const blob = await response.blob();
 
-            // Convert blob to base64
-            const base64File = await this.readFileAsBase64(blob);
-
             // Clean up the blob URL after reading
             URL.revokeObjectURL(fileUrl);
 
-            await this.convertPdfToImages(base64File);
+            await this.convertPdfToImages(blob);
         } catch (error) {
             this.state.isProcessing = false;
             this.action.doAction({
@@ -131,31 +128,19 @@ export class ExtractionPageSelector extends Component {
         }
     }
 
-    readFileAsBase64(file) {
-        return new Promise((resolve, reject) => {
-            const reader = new FileReader();
-
-            reader.onload = (e) => {
-                // Remove the data:application/pdf;base64, prefix
-                const base64 = e.target.result.split(',')[1];
-                resolve(base64);
-            };
-
-            reader.onerror = (error) => {
-                reject(error);
-            };
-
-            reader.readAsDataURL(file);
-        });
-    }
-
     // File upload is handled by upload_area.js, this component only receives the file
 
-    async convertPdfToImages(base64File) {
+    async convertPdfToImages(file) {
         try {
-            const result = await this.rpc("/robotia/pdf_to_images", {
-                pdf_file: base64File,
+            // Multipart upload: the PDF is sent as-is, without a base64 copy
+            const formData = new FormData();
+            formData.append("pdf_file", file, this.state.fileName);
+            formData.append("csrf_token", odoo.csrf_token);
+            const response = await fetch("/robotia/pdf_to_images/upload", {
+                method: "POST",
+                body: formData,
             });
+            const result = await response.json();
 
             if (result.status === "success") {
                 this.state.pages = result.pages; // Metadata array
@@ -163,8 +148,7 @@ export class ExtractionPageSelector extends Component {
                 this.state.selectedPages = new Set(
                     result.pages.map(page => page.attachment_id)
                 );
-                // Store original PDF base64 for extraction
-                this.state.base64File = base64File;
+                this.state.hasFile = true;
 
                 // Re-setup intersection observer for new pages
                 setTimeout(() => this.setupIntersectionObserver(), 200);
@@ -352,7 +336,7 @@ export class ExtractionPageSelector extends Component {
             return;
         }
 
-        if (!this.state.base64File) {
+        if (!this.state.hasFile) {
             this.notification.add(_t("File data is missing"), { type: "danger" });
             return;
         }
@@ -479,4 +463,4 @@ export class ExtractionPageSelector extends Component {
 
 ExtractionPageSelector.template = "robotia_document_extractor.ExtractionPageSelector";
 
-registry.category("actions").add("robotia_document_extractor.page_selector", ExtractionPageSelector);
+registry.category("actions").add("robotia_document_extractor.page_selector", ExtractionPageSelector, { force: true });
@@ -0,0 +1,53 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { loadBundle } from "@web/core/assets";
+
+/**
+ * Lazy client action loaders
+ *
+ * Dashboards, the page selector, the settings dashboard and the chatbot
+ * (with their templates and styles) live in the
+ * `robotia_document_extractor.lazy_assets` bundle so they are not shipped
+ * with every backend page load. Each tag below is registered with a small
+ * loader that fetches the bundle on first use; the bundle then re-registers
+ * the real component under the same tag (with `force: true`) and the action
+ * is executed again.
+ */
+export const LAZY_ASSETS_BUNDLE = "robotia_document_extractor.lazy_assets";
+
+const LAZY_ACTION_TAGS = [
+    "document_extractor.dashboard",
+    "robotia_document_extractor.page_selector",
+    "document_extractor.substance_dashboard",
+    "document_extractor.company_dashboard",
+    "document_extractor.equipment_dashboard",
+    "document_extractor.recovery_dashboard",
+    "document_extractor.hfc_dashboard",
+    "document_extractor.overview_dashboard",
+    "document_extractor.settings_dashboard",
+    "document_extractor.chatbot",
+];
+
+const actionRegistry = registry.category("actions");
+
+function addLazyAction(tag) {
+    const lazyLoader = async (env, action) => {
+        await loadBundle(LAZY_ASSETS_BUNDLE);
+        if (actionRegistry.get(tag) === lazyLoader) {
+            // The bundle failed to register the real component (e.g. a
+            // crash while loading it). Replace the loader to avoid looping.
+            actionRegistry.add(tag, () => {
+                console.error(`Client action ${tag} could not be loaded from ${LAZY_ASSETS_BUNDLE}`);
+            }, { force: true });
+        }
+        // Returning the action makes the action service execute it again,
+        // this time with the real component
+        return action;
+    };
+    actionRegistry.add(tag, lazyLoader);
+}
+
+for (const tag of LAZY_ACTION_TAGS) {
+    addLazyAction(tag);
+}